@@ -0,0 +1,44 @@
+"""User activity calendar
+
+Revision ID: 5d1e8b7c40a2
+Revises: a3f9c2d81b47
+Create Date: 2026-10-18 10:04:12.527913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1e8b7c40a2'
+down_revision: Union[str, None] = 'a3f9c2d81b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_activity',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+    op.create_index('ix_streak_habit_id_date_completed', 'streak', ['habit_id', 'date_completed'], unique=False)
+
+    # Backfill the calendar from the existing streak history
+    op.execute(
+        """
+        INSERT INTO user_activity (user_id, day)
+        SELECT DISTINCT habit.user_id, CAST(streak.date_completed AS DATE)
+        FROM streak JOIN habit ON habit.id = streak.habit_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_streak_habit_id_date_completed', table_name='streak')
+    op.drop_table('user_activity')
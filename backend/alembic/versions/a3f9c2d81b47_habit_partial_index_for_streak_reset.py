@@ -0,0 +1,34 @@
+"""Habit partial index for streak reset
+
+Revision ID: a3f9c2d81b47
+Revises: 2be3f57a7637
+Create Date: 2026-10-18 09:12:40.118230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9c2d81b47'
+down_revision: Union[str, None] = '2be3f57a7637'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_habit_last_completed_date_active',
+        'habit',
+        ['last_completed_date'],
+        unique=False,
+        postgresql_where=sa.text('current_streak <> 0'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_habit_last_completed_date_active', table_name='habit')
@@ -0,0 +1,38 @@
+"""Dynamic model registry
+
+Revision ID: b8d41f6e2c95
+Revises: 5d1e8b7c40a2
+Create Date: 2026-10-18 11:20:36.408152
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d41f6e2c95'
+down_revision: Union[str, None] = '5d1e8b7c40a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('dynamic_model',
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('table_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('definition', sa.JSON(), nullable=False),
+    sa.Column('search_mode', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_index(op.f('ix_dynamic_model_table_name'), 'dynamic_model', ['table_name'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_dynamic_model_table_name'), table_name='dynamic_model')
+    op.drop_table('dynamic_model')
@@ -0,0 +1,109 @@
+import os
+import threading
+from typing import Dict, List, Optional
+
+# Record which filters, sorts and searches the dynamic list endpoints see, for the index advisor
+INDEX_ADVISOR = os.getenv("SAAD_INDEX_ADVISOR", "true").lower() == "true"
+# Distinct query shapes kept per table; once full, the least used shape makes room for a new one
+ADVISOR_SHAPES = int(os.getenv("SAAD_ADVISOR_SHAPES", "128"))
+
+# Operators that pin a column to a value or a set of values, so it can lead a btree index
+EQUALITY_OPERATORS = {"eq", "in", "is_null"}
+# Operators a btree index can serve as a range on the column after the equality columns
+RANGE_OPERATORS = {"lt", "lte", "gt", "gte", "between", "prefix"}
+
+
+class ShapeStats:
+    """Counters for one query shape, plus the most recent request of that shape to EXPLAIN."""
+    __slots__ = ("count", "seconds", "max_seconds", "sample")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.sample: Optional[dict] = None
+
+
+class WorkloadStats:
+    """
+    Per-table counts and latencies of list queries, keyed by their shape:
+    the (field, operator) pairs filtered on, the sort column and whether a
+    search was applied. Values are not part of the shape. Memory is bounded
+    by the number of tables times max_shapes, and recording a request is a
+    dict lookup under a lock.
+    """
+
+    def __init__(self, max_shapes: int = ADVISOR_SHAPES):
+        self.max_shapes = max_shapes
+        self.tables: Dict[str, Dict[tuple, ShapeStats]] = {}
+        self.lock = threading.Lock()
+
+    def record(
+        self,
+        table_name: str,
+        filter_dict: Dict[str, dict],
+        sort_by: Optional[str],
+        search: Optional[str],
+        page_size: int,
+        seconds: float
+    ) -> None:
+        filters = tuple(sorted((field, op) for field, operators in filter_dict.items() for op in operators))
+        key = (filters, sort_by, bool(search))
+        with self.lock:
+            shapes = self.tables.setdefault(table_name, {})
+            stats = shapes.get(key)
+            if stats is None:
+                if len(shapes) >= self.max_shapes:
+                    del shapes[min(shapes, key=lambda shape: shapes[shape].count)]
+                stats = shapes[key] = ShapeStats()
+            stats.count += 1
+            stats.seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.sample = {"filter": filter_dict, "search": search, "page_size": page_size}
+
+    def snapshot(self, table_name: Optional[str] = None) -> Dict[str, List[dict]]:
+        """Copy of the recorded shapes, busiest first, for one table or all of them."""
+        with self.lock:
+            tables = {
+                name: list(shapes.items()) for name, shapes in self.tables.items()
+                if table_name is None or name == table_name
+            }
+        return {
+            name: sorted((
+                {
+                    "filters": [list(pair) for pair in filters],
+                    "sort_by": sort_by,
+                    "search": search,
+                    "count": stats.count,
+                    "seconds": stats.seconds,
+                    "mean_ms": round(stats.seconds / stats.count * 1000, 3),
+                    "max_ms": round(stats.max_seconds * 1000, 3),
+                    "sample": stats.sample,
+                }
+                for (filters, sort_by, search), stats in shapes
+            ), key=lambda shape: shape["seconds"], reverse=True)
+            for name, shapes in tables.items()
+        }
+
+
+def index_columns(filters: List[list], sort_by: Optional[str]) -> List[str]:
+    """
+    Column order for a btree index serving a query shape: the equality
+    columns first, then one range column, or the sort column when there is
+    no range so the index also returns rows in order.
+    """
+    columns = list(dict.fromkeys(field for field, op in filters if op in EQUALITY_OPERATORS))
+    ranges = [field for field, op in filters if op in RANGE_OPERATORS and field not in columns]
+    if ranges:
+        columns.append(ranges[0])
+    elif sort_by and sort_by not in columns:
+        columns.append(sort_by)
+    return columns
+
+
+def plan_nodes(plan: dict) -> List[dict]:
+    """Flatten an EXPLAIN (FORMAT JSON) plan tree."""
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
@@ -1,9 +1,16 @@
 import os
-from typing import Annotated
+import threading
+import time
+from typing import Annotated, Dict
 from dotenv import load_dotenv
 
 from fastapi import Depends
+from sqlalchemy import Engine, exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlmodel import create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.profiler import startup_profiler
 
 #load env variables
 load_dotenv()
@@ -19,8 +26,133 @@ POSTGRES_DB = os.getenv("POSTGRES_DB")
 
 DATABASE_URL = f"postgresql+psycopg://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
-#creates a database engine using the connection string
-engine = create_engine(DATABASE_URL)
+# Connection pool settings, per engine and per worker process. Each worker holds
+# one sync and one async pool, so size max_connections for
+# workers * 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+
+class PoolStatsMixin:
+    """Records how often and how long callers wait to check out a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.stats["checkouts"] += 1
+            self.stats["wait_seconds"] += waited
+            self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], waited)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class TimedQueuePool(PoolStatsMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(PoolStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# Engine registry: one sync and one async engine per URL, shared by app.db and Saad
+_engines: Dict[str, Engine] = {}
+_async_engines: Dict[str, AsyncEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def _pool_options(url: str, pool_class) -> dict:
+    if not url.startswith("postgresql"):
+        return {}
+    return {
+        "poolclass": pool_class,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def _init_stats(engine) -> None:
+    engine.pool.stats = {"checkouts": 0, "timeouts": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+
+def get_engine(url: str | None = None) -> Engine:
+    """Return the shared sync engine for url, creating it on first use."""
+    url = url or DATABASE_URL
+    engine = _engines.get(url)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(url)
+            if engine is None:
+                with startup_profiler.section("create sync engine"):
+                    engine = create_engine(url, **_pool_options(url, TimedQueuePool))
+                _init_stats(engine)
+                _engines[url] = engine
+    return engine
+
+
+def get_async_engine(url: str | None = None) -> AsyncEngine:
+    """Return the shared async engine for url, creating it on first use."""
+    url = url or DATABASE_URL
+    engine = _async_engines.get(url)
+    if engine is None:
+        with _engines_lock:
+            engine = _async_engines.get(url)
+            if engine is None:
+                with startup_profiler.section("create async engine"):
+                    engine = create_async_engine(url, **_pool_options(url, TimedAsyncQueuePool))
+                _init_stats(engine.sync_engine)
+                _async_engines[url] = engine
+    return engine
+
+
+def pool_stats() -> dict:
+    """Snapshot of every registered pool, keyed by engine kind and database."""
+    stats = {}
+    for kind, engines in (("sync", _engines), ("async", _async_engines)):
+        for url, engine in list(engines.items()):
+            pool = engine.pool
+            counters = getattr(pool, "stats", {})
+            checkouts = counters.get("checkouts", 0)
+            entry = {"pool": type(pool).__name__}
+            if isinstance(pool, QueuePool):
+                entry.update({
+                    "size": pool.size(),
+                    "checked_in": pool.checkedin(),
+                    "checked_out": pool.checkedout(),
+                    "overflow": max(pool.overflow(), 0),
+                    "max_overflow": pool._max_overflow,
+                })
+            entry.update({
+                "checkouts": checkouts,
+                "timeouts": counters.get("timeouts", 0),
+                "avg_wait_ms": round(counters.get("wait_seconds", 0.0) / checkouts * 1000, 3) if checkouts else 0.0,
+                "max_wait_ms": round(counters.get("max_wait_seconds", 0.0) * 1000, 3),
+            })
+            stats[f"{kind}:{engine.url.render_as_string(hide_password=True)}"] = entry
+    return stats
+
+
+def __getattr__(name: str):
+    # Keep `from app.db import engine` working without connecting at import time
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 #initializes the database by creating tables
@@ -28,7 +160,13 @@ def init_db(session: Session) -> None:
     pass
 
 def get_session():
-    with Session(engine) as session:
+    with Session(get_engine()) as session:
+        yield session
+
+async def get_async_session():
+    # expire_on_commit=False so returning a committed object doesn't trigger a lazy reload
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
         yield session
 
-SessionDep = Annotated[Session, Depends(get_session)]
\ No newline at end of file
+SessionDep = Annotated[Session, Depends(get_session)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
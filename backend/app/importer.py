@@ -0,0 +1,349 @@
+import argparse
+import csv
+import datetime
+import io
+import logging
+import os
+import sys
+import time
+from importlib import import_module
+from typing import Callable, Dict, IO, List, Optional, Type
+
+from sqlalchemy import Engine, func, insert, select, text
+from sqlmodel import SQLModel
+
+logger = logging.getLogger(__name__)
+
+# Rows per COPY / INSERT batch; each batch is committed on its own
+IMPORT_BATCH_SIZE = int(os.getenv("SAAD_IMPORT_BATCH_SIZE", "50000"))
+# Rejected rows echoed back in the import summary (all of them go to the reject file)
+IMPORT_REPORTED_REJECTS = int(os.getenv("SAAD_IMPORT_REPORTED_REJECTS", "100"))
+
+TRUE_VALUES = {"true", "t", "1", "yes", "y"}
+FALSE_VALUES = {"false", "f", "0", "no", "n"}
+
+
+def normalize_header(name: str) -> str:
+    # Model fields have spaces replaced by underscores, see Saad.create_dynamic_model
+    return name.strip().replace(" ", "_").lower()
+
+
+def parse_bool(value: str) -> bool:
+    lowered = value.lower()
+    if lowered in TRUE_VALUES:
+        return True
+    if lowered in FALSE_VALUES:
+        return False
+    raise ValueError(f"invalid boolean {value!r}")
+
+
+PARSERS: Dict[type, Callable[[str], object]] = {
+    int: int,
+    float: float,
+    bool: parse_bool,
+    datetime.datetime: datetime.datetime.fromisoformat,
+    datetime.date: datetime.date.fromisoformat,
+}
+
+
+class RejectWriter:
+    """Collects rows that could not be imported, writing them to an optional reject CSV."""
+
+    def __init__(self, header: List[str], path: Optional[str] = None, reported: int = IMPORT_REPORTED_REJECTS):
+        self.header = header
+        self.path = path
+        self.reported = reported
+        self.count = 0
+        self.samples: List[dict] = []
+        self.file = None
+        self.writer = None
+
+    def add(self, line: int, row: List[str], error) -> None:
+        self.count += 1
+        message = str(getattr(error, "orig", error)).strip()
+        if len(self.samples) < self.reported:
+            self.samples.append({"line": line, "error": message})
+        if self.path:
+            if self.writer is None:
+                self.file = open(self.path, "w", newline="")
+                self.writer = csv.writer(self.file)
+                self.writer.writerow(["line", "error", *self.header])
+            self.writer.writerow([line, message, *row])
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+
+
+class CsvImporter:
+    """
+    Loads a CSV with a header row into a dynamic model's table.
+    Headers are matched to the model's columns and each value is parsed with
+    the column's Python type, so bad rows are rejected before they reach the
+    database. On psycopg, batches are loaded with COPY ... FROM STDIN.
+    Other drivers (e.g. SQLite) use batched executemany INSERTs.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        model_class: Type[SQLModel],
+        batch_size: int = IMPORT_BATCH_SIZE,
+        reject_file: Optional[str] = None,
+        skip_unknown: bool = False,
+        progress: Optional[Callable[[dict], None]] = None,
+    ):
+        self.engine = engine
+        self.model_class = model_class
+        self.table = model_class.__table__
+        self.batch_size = batch_size
+        self.reject_file = reject_file
+        self.skip_unknown = skip_unknown
+        self.progress = progress
+        self.use_copy = engine.dialect.driver == "psycopg"
+
+    def python_type(self, column) -> type:
+        """The field's declared type on the model (Optional unwrapped), falling back to the column type."""
+        field = self.model_class.model_fields.get(column.name)
+        if field is not None:
+            annotation = field.annotation
+            args = [arg for arg in getattr(annotation, "__args__", ()) if arg is not type(None)]
+            return args[0] if args else annotation
+        try:
+            return column.type.python_type
+        except NotImplementedError:
+            return str
+
+    def map_header(self, header: List[str]) -> list:
+        """Return (csv position, column, type) triples for the header, rejecting unknown or missing columns."""
+        columns = {column.name.lower(): column for column in self.table.columns}
+        mapping, unknown = [], []
+        for position, name in enumerate(header):
+            column = columns.get(normalize_header(name))
+            if column is None:
+                unknown.append(name)
+            elif any(mapped is column for _, mapped, _ in mapping):
+                raise ValueError(f"Column {column.name} appears more than once in the CSV header")
+            else:
+                mapping.append((position, column, self.python_type(column)))
+        if unknown and not self.skip_unknown:
+            raise ValueError(f"Unknown CSV columns for {self.table.name}: {', '.join(unknown)}")
+
+        mapped = {column.name for _, column, _ in mapping}
+        missing = [
+            column.name for column in self.table.columns
+            if column.name not in mapped and not column.nullable and not column.primary_key
+            and column.default is None and column.server_default is None
+        ]
+        if missing:
+            raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+        return mapping
+
+    def defaults(self, mapping: list) -> list:
+        """Scalar Python defaults for columns absent from the CSV; COPY would otherwise leave them NULL."""
+        mapped = {column.name for _, column, _ in mapping}
+        return [
+            (column, column.default.arg) for column in self.table.columns
+            if column.name not in mapped and column.default is not None and column.default.is_scalar
+        ]
+
+    def parse_row(self, row: List[str], mapping: list, defaults: list) -> tuple:
+        """Convert one CSV record to a tuple of column values; raises ValueError for bad rows."""
+        values = []
+        for position, column, python_type in mapping:
+            raw = row[position] if position < len(row) else ""
+            if raw == "":
+                if python_type is str and not column.nullable:
+                    values.append(raw)
+                    continue
+                if not column.nullable:
+                    raise ValueError(f"{column.name} is required")
+                values.append(None)
+                continue
+            parser = PARSERS.get(python_type)
+            try:
+                values.append(parser(raw.strip()) if parser else raw)
+            except ValueError:
+                raise ValueError(f"{column.name}: cannot parse {raw!r} as {python_type.__name__}")
+        values.extend(value for _, value in defaults)
+        return tuple(values)
+
+    def load_batch(self, conn, columns: list, rows: list) -> None:
+        if self.use_copy:
+            quote = self.engine.dialect.identifier_preparer.quote
+            statement = f"COPY {quote(self.table.name)} ({', '.join(quote(column.name) for column in columns)}) FROM STDIN"
+            with conn.connection.cursor() as cursor:
+                with cursor.copy(statement) as copy:
+                    for values in rows:
+                        copy.write_row(values)
+        else:
+            names = [column.name for column in columns]
+            conn.execute(insert(self.table), [dict(zip(names, values)) for values in rows])
+
+    def flush(self, columns: list, batch: list, rejects: RejectWriter) -> int:
+        """Load a batch in one transaction; if the database refuses it, retry row by row to isolate the bad rows."""
+        rows = [values for _, _, values in batch]
+        try:
+            with self.engine.begin() as conn:
+                self.load_batch(conn, columns, rows)
+            return len(rows)
+        except Exception as e:
+            logger.warning("Import batch failed, retrying rows individually: %s", e, extra={"table": self.table.name, "rows": len(rows)})
+
+        loaded = 0
+        with self.engine.begin() as conn:
+            for line, row, values in batch:
+                savepoint = conn.begin_nested()
+                try:
+                    conn.execute(insert(self.table).values(dict(zip([column.name for column in columns], values))))
+                    savepoint.commit()
+                    loaded += 1
+                except Exception as e:
+                    savepoint.rollback()
+                    rejects.add(line, row, e)
+        return loaded
+
+    def sync_sequence(self, conn) -> None:
+        """Move the id sequence past explicitly imported ids so later inserts don't collide."""
+        if self.engine.dialect.name != "postgresql" or "id" not in self.table.columns:
+            return
+        max_id = conn.execute(select(func.max(self.table.c.id))).scalar()
+        if max_id is not None:
+            conn.execute(
+                text("SELECT setval(pg_get_serial_sequence(:table_name, 'id'), :max_id)"),
+                {"table_name": self.table.name, "max_id": max_id},
+            )
+
+    def run(self, source: IO[str]) -> dict:
+        """Import every record from a text stream and return a summary."""
+        started = time.perf_counter()
+        reader = csv.reader(source)
+        try:
+            header = next(reader)
+        except StopIteration:
+            raise ValueError("CSV is empty; a header row is required")
+        mapping = self.map_header(header)
+        defaults = self.defaults(mapping)
+        columns = [column for _, column, _ in mapping] + [column for column, _ in defaults]
+
+        rejects = RejectWriter(header, self.reject_file)
+        processed = imported = 0
+        batch = []
+        try:
+            for row in reader:
+                if not any(field.strip() for field in row):
+                    continue
+                processed += 1
+                try:
+                    batch.append((reader.line_num, row, self.parse_row(row, mapping, defaults)))
+                except ValueError as e:
+                    rejects.add(reader.line_num, row, e)
+                if len(batch) >= self.batch_size:
+                    imported += self.flush(columns, batch, rejects)
+                    batch = []
+                    self.report(processed, imported, rejects.count, started)
+            if batch:
+                imported += self.flush(columns, batch, rejects)
+            if any(column.name == "id" for column in columns):
+                with self.engine.begin() as conn:
+                    self.sync_sequence(conn)
+        finally:
+            rejects.close()
+
+        summary = self.report(processed, imported, rejects.count, started)
+        summary.update({
+            "method": "copy" if self.use_copy else "insert",
+            "rejects": rejects.samples,
+            "reject_file": self.reject_file if rejects.count else None,
+        })
+        return summary
+
+    def report(self, processed: int, imported: int, rejected: int, started: float) -> dict:
+        elapsed = time.perf_counter() - started
+        progress = {
+            "table": self.table.name,
+            "processed": processed,
+            "imported": imported,
+            "rejected": rejected,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(imported / elapsed) if elapsed else None,
+        }
+        if self.progress:
+            self.progress(progress)
+        else:
+            logger.info("Import %(table)s: %(processed)d rows read, %(imported)d imported, %(rejected)d rejected", progress)
+        return progress
+
+
+def load_model(table_name: str) -> Type[SQLModel]:
+    """Find the generated model class for a dynamic table in app/models/<table>/model.py."""
+    module = import_module(f"app.models.{table_name}.model")
+    for value in vars(module).values():
+        if isinstance(value, type) and issubclass(value, SQLModel) and getattr(value, "__table__", None) is not None:
+            if value.__table__.name == table_name:
+                return value
+    raise ValueError(f"No table model named {table_name} in {module.__name__}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """python -m app.importer <table> <file.csv> [--reject-file rejects.csv]"""
+    parser = argparse.ArgumentParser(description="Import a CSV file into a dynamic table")
+    parser.add_argument("table", help="Table name: a folder under app/models or a model in the dynamic_model registry")
+    parser.add_argument("csv_file", help="CSV file with a header row, or - for stdin")
+    parser.add_argument("--reject-file", help="Write rows that could not be imported to this CSV")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--skip-unknown", action="store_true", help="Ignore CSV columns the table doesn't have")
+    parser.add_argument("--database-url", help="Defaults to the app's DATABASE_URL")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+
+    from app.db import get_engine
+
+    def progress(stats: dict) -> None:
+        print(
+            f"\r{stats['processed']} read, {stats['imported']} imported, {stats['rejected']} rejected "
+            f"({stats['rows_per_second'] or 0} rows/s)",
+            end="", file=sys.stderr, flush=True,
+        )
+
+    module_name = f"app.models.{args.table}.model"
+    try:
+        model_class = load_model(args.table)
+    except ModuleNotFoundError as e:
+        if not e.name or not module_name.startswith(e.name):
+            raise
+        # No generated model.py: the model was defined with SAAD_MODEL_STORE=database.
+        # Imported here: app.routes.engine imports this module
+        from app.routes.engine import Saad
+        model_class = Saad(db_url=args.database_url).load_stored_models(args.table)
+        if model_class is None:
+            print(f"Import failed: no model for table {args.table} in app/models or the dynamic_model registry", file=sys.stderr)
+            return 1
+
+    importer = CsvImporter(
+        get_engine(args.database_url),
+        model_class,
+        batch_size=args.batch_size,
+        reject_file=args.reject_file,
+        skip_unknown=args.skip_unknown,
+        progress=progress,
+    )
+    try:
+        if args.csv_file == "-":
+            summary = importer.run(io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline=""))
+        else:
+            with open(args.csv_file, encoding="utf-8-sig", newline="") as source:
+                summary = importer.run(source)
+    except ValueError as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    print(f"Imported {summary['imported']} rows into {summary['table']} in {summary['seconds']}s via {summary['method']}")
+    if summary["rejected"]:
+        print(f"Rejected {summary['rejected']} rows" + (f", see {summary['reject_file']}" if summary["reject_file"] else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
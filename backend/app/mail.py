@@ -0,0 +1,268 @@
+import os
+import queue
+import threading
+import time
+import logging
+
+from emails.backend import SMTPBackend
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+logger = logging.getLogger(__name__)
+
+# Delivery tuning
+MAIL_QUEUE_SIZE = int(os.getenv("MAIL_QUEUE_SIZE", "1000"))
+MAIL_WORKERS = int(os.getenv("MAIL_WORKERS", "2"))
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", "20"))
+MAIL_MAX_RETRIES = int(os.getenv("MAIL_MAX_RETRIES", "3"))
+MAIL_RETRY_BACKOFF = float(os.getenv("MAIL_RETRY_BACKOFF", "2"))
+MAIL_IDLE_TIMEOUT = float(os.getenv("MAIL_IDLE_TIMEOUT", "30"))
+MAIL_BREAKER_THRESHOLD = int(os.getenv("MAIL_BREAKER_THRESHOLD", "5"))
+MAIL_BREAKER_COOLDOWN = float(os.getenv("MAIL_BREAKER_COOLDOWN", "60"))
+
+# Email templates
+MAIL_TEMPLATE_DIR = os.getenv("MAIL_TEMPLATE_DIR", os.path.join(os.path.dirname(__file__), "templates"))
+MAIL_TEMPLATE_CACHE_DIR = os.getenv("MAIL_TEMPLATE_CACHE_DIR")  # defaults to the system temp dir
+MAIL_INLINE_CSS = os.getenv("MAIL_INLINE_CSS", "true").lower() == "true"
+
+
+class InliningLoader(FileSystemLoader):
+    """Loads templates from disk with their CSS already inlined into style attributes."""
+
+    def __init__(self, searchpath, inline_css: bool = True):
+        super().__init__(searchpath)
+        self.inline_css = inline_css
+
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+        if self.inline_css and template.endswith(".html"):
+            # Imported here so premailer/lxml only load once a template is needed
+            from premailer import transform
+            source = transform(source, keep_style_tags=False, remove_classes=False, disable_validation=True)
+        return source, filename, uptodate
+
+
+class TemplateRegistry:
+    """
+    Jinja environment for email templates. Each template is read, CSS-inlined
+    and compiled once, then kept in the environment cache; compiled bytecode
+    is also cached on disk so restarts skip compilation.
+    Jinja expressions should stay in text or attribute values so inlining leaves them intact.
+    """
+
+    def __init__(self, directory: str = MAIL_TEMPLATE_DIR, cache_dir: str | None = MAIL_TEMPLATE_CACHE_DIR, inline_css: bool = MAIL_INLINE_CSS):
+        self.directory = directory
+        self.env = Environment(
+            loader=InliningLoader(directory, inline_css=inline_css),
+            autoescape=select_autoescape(["html"]),
+            bytecode_cache=FileSystemBytecodeCache(cache_dir) if cache_dir else FileSystemBytecodeCache(),
+            auto_reload=False,
+        )
+
+    def preload(self) -> None:
+        """Compile every HTML template up front so the first send doesn't pay for it."""
+        for name in self.env.list_templates(extensions=["html"]):
+            self.env.get_template(name)
+
+    def render(self, name: str, context: dict) -> str:
+        return self.env.get_template(name).render(**context)
+
+
+class CircuitBreaker:
+    """Stops delivery attempts for a cooldown period after repeated connection failures."""
+
+    def __init__(self, threshold: int = MAIL_BREAKER_THRESHOLD, cooldown: float = MAIL_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                if self.opened_at is None:
+                    logger.warning("SMTP circuit breaker opened after %d consecutive failures", self.failures)
+                self.opened_at = time.monotonic()
+
+
+class OutgoingMail:
+    def __init__(self, message, email_to: str):
+        self.message = message
+        self.email_to = email_to
+        self.attempts = 0
+
+
+class MailDispatcher:
+    """
+    Bounded in-process mail queue drained by a pool of worker threads.
+    Each worker keeps one SMTP connection open and sends messages in batches
+    over it. It closes the connection once the queue has been idle for a while.
+    """
+
+    def __init__(
+        self,
+        smtp_conf: dict,
+        workers: int = MAIL_WORKERS,
+        queue_size: int = MAIL_QUEUE_SIZE,
+        batch_size: int = MAIL_BATCH_SIZE,
+        max_retries: int = MAIL_MAX_RETRIES,
+        retry_backoff: float = MAIL_RETRY_BACKOFF,
+        idle_timeout: float = MAIL_IDLE_TIMEOUT,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.smtp_conf = smtp_conf
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.idle_timeout = idle_timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.queue: queue.Queue[OutgoingMail] = queue.Queue(maxsize=queue_size)
+        self.threads: list[threading.Thread] = []
+        self.stopping = threading.Event()
+        self.start_lock = threading.Lock()
+        self.metrics_lock = threading.Lock()
+        self.metrics = {"queued": 0, "sent": 0, "failed": 0, "retried": 0, "dropped": 0, "batches": 0, "connections": 0}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self.metrics_lock:
+            self.metrics[name] += amount
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self.threads)
+
+    def start(self) -> None:
+        with self.start_lock:
+            if self.running:
+                return
+            self.stopping.clear()
+            self.threads = [
+                threading.Thread(target=self._worker, name=f"mail-worker-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self.threads:
+                thread.start()
+
+    def stop(self, timeout: float = 10) -> None:
+        """Let the workers drain what is already queued, then close their connections."""
+        self.stopping.set()
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+
+    def enqueue(self, message, email_to: str) -> bool:
+        """Queue a message for delivery; returns False if the queue is full."""
+        if not self.running:
+            self.start()
+        return self._put(OutgoingMail(message, email_to), count_as="queued")
+
+    def _put(self, mail: OutgoingMail, count_as: str) -> bool:
+        try:
+            self.queue.put_nowait(mail)
+        except queue.Full:
+            logger.error("Mail queue full, dropping message to %s", mail.email_to)
+            self._count("dropped")
+            return False
+        self._count(count_as)
+        return True
+
+    def _retry_later(self, mail: OutgoingMail, error) -> None:
+        if mail.attempts > self.max_retries:
+            logger.error("Giving up on email to %s after %d attempts: %s", mail.email_to, mail.attempts, error)
+            self._count("failed")
+            return
+        delay = self.retry_backoff * 2 ** (mail.attempts - 1)
+        timer = threading.Timer(delay, self._put, args=(mail, "retried"))
+        timer.daemon = True
+        timer.start()
+
+    def _next_batch(self) -> list[OutgoingMail]:
+        try:
+            batch = [self.queue.get(timeout=1)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self) -> None:
+        backend = None
+        last_used = time.monotonic()
+        try:
+            while True:
+                if not self.breaker.allow():
+                    if self.stopping.is_set():
+                        break
+                    time.sleep(1)
+                    continue
+
+                batch = self._next_batch()
+                if not batch:
+                    if self.stopping.is_set():
+                        break
+                    if backend is not None and time.monotonic() - last_used > self.idle_timeout:
+                        backend.close()
+                        backend = None
+                    continue
+
+                self._count("batches")
+                for index, mail in enumerate(batch):
+                    if backend is None:
+                        backend = SMTPBackend(**self.smtp_conf)
+                        self._count("connections")
+                    mail.attempts += 1
+                    try:
+                        response = mail.message.send(to=mail.email_to, smtp=backend)
+                        error = None if response.status_code == 250 else response.error
+                    except Exception as exc:
+                        error = exc
+                    if error is None:
+                        self.breaker.record_success()
+                        self._count("sent")
+                        continue
+
+                    # Assume the connection is bad: reopen it and back off this message
+                    backend.close()
+                    backend = None
+                    self.breaker.record_failure()
+                    self._retry_later(mail, error)
+                    if not self.breaker.allow():
+                        # Server is down; requeue the rest of the batch untouched
+                        for pending in batch[index + 1:]:
+                            self._put(pending, count_as="retried")
+                        break
+                last_used = time.monotonic()
+        finally:
+            if backend is not None:
+                backend.close()
+
+    def stats(self) -> dict:
+        with self.metrics_lock:
+            metrics = dict(self.metrics)
+        return {
+            **metrics,
+            "pending": self.queue.qsize(),
+            "workers": sum(thread.is_alive() for thread in self.threads),
+            "breaker": self.breaker.state,
+        }
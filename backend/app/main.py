@@ -1,13 +1,19 @@
+# Imported first so STARTUP_PROFILE=true can time every import below
+from app.profiler import startup_profiler
+from app.logs import logging_stats, setup_logging
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import main
-from app.db import get_session
+from app.routes.rest import core
+from app.db import get_async_engine, get_engine, get_session, pool_stats
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
-from app.utils import reset_missed_streaks
+from app.utils import email_templates, get_user_cache_stats, mail_dispatcher, reset_missed_streaks
 from contextlib import asynccontextmanager
 
+setup_logging()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
@@ -23,10 +29,24 @@ async def lifespan(app: FastAPI):
         replace_existing=True
     )
     
+    with startup_profiler.section("preload email templates"):
+        email_templates.preload()
+    if core.model_store == "database":
+        # One query for every stored model definition; models and routes are built in memory
+        with startup_profiler.section("load stored models"):
+            core.load_stored_models()
+    mail_dispatcher.start()
+    if startup_profiler.enabled:
+        # Engines are otherwise created by the first request; build them now so they show in the report
+        get_engine()
+        get_async_engine()
+    startup_profiler.emit()
+    
     yield
     
     # Shutdown
     scheduler.shutdown()
+    mail_dispatcher.stop()
 
 app = FastAPI(
     title="Habitly",
@@ -49,7 +69,8 @@ app.add_middleware(
 )
 
 # Include the main router with prefix
-app.include_router(main.router,)
+with startup_profiler.section("include routers"):
+    app.include_router(main.router,)
 
 @app.get("/", tags=[" check"])
 def read_root():
@@ -61,4 +82,26 @@ def check_scheduler():
     return {
         "running": scheduler.running,
         "jobs": [str(job) for job in scheduler.get_jobs()]
-    }
\ No newline at end of file
+    }
+
+@app.get("/db/pool")
+def check_pool():
+    return pool_stats()
+
+@app.get("/auth/user-cache")
+def check_user_cache():
+    return get_user_cache_stats()
+
+@app.get("/mail/status")
+def check_mail():
+    return mail_dispatcher.stats()
+
+@app.get("/logging/status")
+def check_logging():
+    return logging_stats()
+
+# Last, after every route of the app's own: the generic dispatcher's /{table}/... routes
+# would otherwise match paths such as /db/pool first and answer "Unknown table"
+with startup_profiler.section("include dynamic routers"):
+    # Generated model routers are discovered from app/models and imported on first use
+    core.mount_dynamic_routers(app)
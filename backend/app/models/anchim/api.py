@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlmodel import Session, select
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
 from .model import Anchim
-from app.db import get_session
+from app.db import get_async_session
+from app.importer import IMPORT_BATCH_SIZE
+from app.routes.engine import BULK_CHUNK_SIZE
 
 router = APIRouter(
     prefix="/anchim",
@@ -10,42 +13,66 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=Anchim)
-async def create_anchim(anchim: Anchim, db: Session = Depends(get_session)):
+async def create_anchim(anchim: Anchim, db: AsyncSession = Depends(get_async_session)):
     db.add(anchim)
-    db.commit()
-    db.refresh(anchim)
+    await db.commit()
+    await db.refresh(anchim)
     return anchim
 
+@router.post("/bulk")
+async def create_anchims_bulk(request: Request, chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=10000), db: AsyncSession = Depends(get_async_session)):
+    # JSON array or NDJSON body; one multi-row INSERT and transaction per chunk
+    from app.routes.rest import core
+    return await core.bulk_insert(db, Anchim, request, chunk_size)
+
+@router.post("/import")
+async def import_anchims(request: Request, batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1), skip_unknown: bool = False):
+    # CSV body with a header row; loaded with COPY on PostgreSQL
+    from app.routes.rest import core
+    return await core.import_csv(Anchim, request, batch_size, skip_unknown)
+
 @router.get("/", response_model=List[Anchim])
-async def read_anchims(db: Session = Depends(get_session)):
-    anchims = db.exec(select(Anchim)).all()
+async def read_anchims(db: AsyncSession = Depends(get_async_session)):
+    anchims = (await db.exec(select(Anchim))).all()
     return anchims
 
+@router.get("/export")
+async def export_anchims(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    sort_by: Optional[str] = None,
+    sort_order: str = Query("asc", regex="^(asc|desc)$"),
+    search: Optional[str] = None,
+    filter: Optional[str] = None
+):
+    # Imported here: app.routes.rest imports this module while building Saad
+    from app.routes.rest import core
+    return core.export_items(Anchim, format, sort_by, sort_order, search, filter)
+
 @router.get("/{item_id}", response_model=Anchim)
-async def read_anchim(item_id: int, db: Session = Depends(get_session)):
-    anchim = db.get(Anchim, item_id)
+async def read_anchim(item_id: int, db: AsyncSession = Depends(get_async_session)):
+    anchim = await db.get(Anchim, item_id)
     if not anchim:
         raise HTTPException(status_code=404, detail="Item not found")
     return anchim
 
 @router.put("/{item_id}", response_model=Anchim)
-async def update_anchim(item_id: int, anchim: Anchim, db: Session = Depends(get_session)):
-    db_item = db.get(Anchim, item_id)
+async def update_anchim(item_id: int, anchim: Anchim, db: AsyncSession = Depends(get_async_session)):
+    db_item = await db.get(Anchim, item_id)
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
     item_data = anchim.dict(exclude_unset=True)
     for key, value in item_data.items():
         setattr(db_item, key, value)
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    await db.commit()
+    await db.refresh(db_item)
     return db_item
 
 @router.delete("/{item_id}")
-async def delete_anchim(item_id: int, db: Session = Depends(get_session)):
-    anchim = db.get(Anchim, item_id)
+async def delete_anchim(item_id: int, db: AsyncSession = Depends(get_async_session)):
+    anchim = await db.get(Anchim, item_id)
     if not anchim:
         raise HTTPException(status_code=404, detail="Item not found")
-    db.delete(anchim)
-    db.commit()
+    await db.delete(anchim)
+    await db.commit()
     return {"message": "Item deleted successfully"}
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlmodel import Session, select
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
 from .model import Atchemalek
-from app.db import get_session
+from app.db import get_async_session
+from app.importer import IMPORT_BATCH_SIZE
+from app.routes.engine import BULK_CHUNK_SIZE
 
 router = APIRouter(
     prefix="/atchemalek",
@@ -10,42 +13,66 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=Atchemalek)
-async def create_atchemalek(atchemalek: Atchemalek, db: Session = Depends(get_session)):
+async def create_atchemalek(atchemalek: Atchemalek, db: AsyncSession = Depends(get_async_session)):
     db.add(atchemalek)
-    db.commit()
-    db.refresh(atchemalek)
+    await db.commit()
+    await db.refresh(atchemalek)
     return atchemalek
 
+@router.post("/bulk")
+async def create_atchemaleks_bulk(request: Request, chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=10000), db: AsyncSession = Depends(get_async_session)):
+    # JSON array or NDJSON body; one multi-row INSERT and transaction per chunk
+    from app.routes.rest import core
+    return await core.bulk_insert(db, Atchemalek, request, chunk_size)
+
+@router.post("/import")
+async def import_atchemaleks(request: Request, batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1), skip_unknown: bool = False):
+    # CSV body with a header row; loaded with COPY on PostgreSQL
+    from app.routes.rest import core
+    return await core.import_csv(Atchemalek, request, batch_size, skip_unknown)
+
 @router.get("/", response_model=List[Atchemalek])
-async def read_atchemaleks(db: Session = Depends(get_session)):
-    atchemaleks = db.exec(select(Atchemalek)).all()
+async def read_atchemaleks(db: AsyncSession = Depends(get_async_session)):
+    atchemaleks = (await db.exec(select(Atchemalek))).all()
     return atchemaleks
 
+@router.get("/export")
+async def export_atchemaleks(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    sort_by: Optional[str] = None,
+    sort_order: str = Query("asc", regex="^(asc|desc)$"),
+    search: Optional[str] = None,
+    filter: Optional[str] = None
+):
+    # Imported here: app.routes.rest imports this module while building Saad
+    from app.routes.rest import core
+    return core.export_items(Atchemalek, format, sort_by, sort_order, search, filter)
+
 @router.get("/{item_id}", response_model=Atchemalek)
-async def read_atchemalek(item_id: int, db: Session = Depends(get_session)):
-    atchemalek = db.get(Atchemalek, item_id)
+async def read_atchemalek(item_id: int, db: AsyncSession = Depends(get_async_session)):
+    atchemalek = await db.get(Atchemalek, item_id)
     if not atchemalek:
         raise HTTPException(status_code=404, detail="Item not found")
     return atchemalek
 
 @router.put("/{item_id}", response_model=Atchemalek)
-async def update_atchemalek(item_id: int, atchemalek: Atchemalek, db: Session = Depends(get_session)):
-    db_item = db.get(Atchemalek, item_id)
+async def update_atchemalek(item_id: int, atchemalek: Atchemalek, db: AsyncSession = Depends(get_async_session)):
+    db_item = await db.get(Atchemalek, item_id)
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
     item_data = atchemalek.dict(exclude_unset=True)
     for key, value in item_data.items():
         setattr(db_item, key, value)
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    await db.commit()
+    await db.refresh(db_item)
     return db_item
 
 @router.delete("/{item_id}")
-async def delete_atchemalek(item_id: int, db: Session = Depends(get_session)):
-    atchemalek = db.get(Atchemalek, item_id)
+async def delete_atchemalek(item_id: int, db: AsyncSession = Depends(get_async_session)):
+    atchemalek = await db.get(Atchemalek, item_id)
     if not atchemalek:
         raise HTTPException(status_code=404, detail="Item not found")
-    db.delete(atchemalek)
-    db.commit()
+    await db.delete(atchemalek)
+    await db.commit()
     return {"message": "Item deleted successfully"}
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlmodel import Session, select
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
 from .model import B
-from app.db import get_session
+from app.db import get_async_session
+from app.importer import IMPORT_BATCH_SIZE
+from app.routes.engine import BULK_CHUNK_SIZE
 
 router = APIRouter(
     prefix="/b",
@@ -10,42 +13,66 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=B)
-async def create_b(b: B, db: Session = Depends(get_session)):
+async def create_b(b: B, db: AsyncSession = Depends(get_async_session)):
     db.add(b)
-    db.commit()
-    db.refresh(b)
+    await db.commit()
+    await db.refresh(b)
     return b
 
+@router.post("/bulk")
+async def create_bs_bulk(request: Request, chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=10000), db: AsyncSession = Depends(get_async_session)):
+    # JSON array or NDJSON body; one multi-row INSERT and transaction per chunk
+    from app.routes.rest import core
+    return await core.bulk_insert(db, B, request, chunk_size)
+
+@router.post("/import")
+async def import_bs(request: Request, batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1), skip_unknown: bool = False):
+    # CSV body with a header row; loaded with COPY on PostgreSQL
+    from app.routes.rest import core
+    return await core.import_csv(B, request, batch_size, skip_unknown)
+
 @router.get("/", response_model=List[B])
-async def read_bs(db: Session = Depends(get_session)):
-    bs = db.exec(select(B)).all()
+async def read_bs(db: AsyncSession = Depends(get_async_session)):
+    bs = (await db.exec(select(B))).all()
     return bs
 
+@router.get("/export")
+async def export_bs(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    sort_by: Optional[str] = None,
+    sort_order: str = Query("asc", regex="^(asc|desc)$"),
+    search: Optional[str] = None,
+    filter: Optional[str] = None
+):
+    # Imported here: app.routes.rest imports this module while building Saad
+    from app.routes.rest import core
+    return core.export_items(B, format, sort_by, sort_order, search, filter)
+
 @router.get("/{item_id}", response_model=B)
-async def read_b(item_id: int, db: Session = Depends(get_session)):
-    b = db.get(B, item_id)
+async def read_b(item_id: int, db: AsyncSession = Depends(get_async_session)):
+    b = await db.get(B, item_id)
     if not b:
         raise HTTPException(status_code=404, detail="Item not found")
     return b
 
 @router.put("/{item_id}", response_model=B)
-async def update_b(item_id: int, b: B, db: Session = Depends(get_session)):
-    db_item = db.get(B, item_id)
+async def update_b(item_id: int, b: B, db: AsyncSession = Depends(get_async_session)):
+    db_item = await db.get(B, item_id)
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
     item_data = b.dict(exclude_unset=True)
     for key, value in item_data.items():
         setattr(db_item, key, value)
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    await db.commit()
+    await db.refresh(db_item)
     return db_item
 
 @router.delete("/{item_id}")
-async def delete_b(item_id: int, db: Session = Depends(get_session)):
-    b = db.get(B, item_id)
+async def delete_b(item_id: int, db: AsyncSession = Depends(get_async_session)):
+    b = await db.get(B, item_id)
     if not b:
         raise HTTPException(status_code=404, detail="Item not found")
-    db.delete(b)
-    db.commit()
+    await db.delete(b)
+    await db.commit()
     return {"message": "Item deleted successfully"}
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlmodel import Session, select
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
 from .model import Brotherss
-from app.db import get_session
+from app.db import get_async_session
+from app.importer import IMPORT_BATCH_SIZE
+from app.routes.engine import BULK_CHUNK_SIZE
 
 router = APIRouter(
     prefix="/brotherss",
@@ -10,42 +13,66 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=Brotherss)
-async def create_brotherss(brotherss: Brotherss, db: Session = Depends(get_session)):
+async def create_brotherss(brotherss: Brotherss, db: AsyncSession = Depends(get_async_session)):
     db.add(brotherss)
-    db.commit()
-    db.refresh(brotherss)
+    await db.commit()
+    await db.refresh(brotherss)
     return brotherss
 
+@router.post("/bulk")
+async def create_brothersss_bulk(request: Request, chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=10000), db: AsyncSession = Depends(get_async_session)):
+    # JSON array or NDJSON body; one multi-row INSERT and transaction per chunk
+    from app.routes.rest import core
+    return await core.bulk_insert(db, Brotherss, request, chunk_size)
+
+@router.post("/import")
+async def import_brothersss(request: Request, batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1), skip_unknown: bool = False):
+    # CSV body with a header row; loaded with COPY on PostgreSQL
+    from app.routes.rest import core
+    return await core.import_csv(Brotherss, request, batch_size, skip_unknown)
+
 @router.get("/", response_model=List[Brotherss])
-async def read_brothersss(db: Session = Depends(get_session)):
-    brothersss = db.exec(select(Brotherss)).all()
+async def read_brothersss(db: AsyncSession = Depends(get_async_session)):
+    brothersss = (await db.exec(select(Brotherss))).all()
     return brothersss
 
+@router.get("/export")
+async def export_brothersss(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    sort_by: Optional[str] = None,
+    sort_order: str = Query("asc", regex="^(asc|desc)$"),
+    search: Optional[str] = None,
+    filter: Optional[str] = None
+):
+    # Imported here: app.routes.rest imports this module while building Saad
+    from app.routes.rest import core
+    return core.export_items(Brotherss, format, sort_by, sort_order, search, filter)
+
 @router.get("/{item_id}", response_model=Brotherss)
-async def read_brotherss(item_id: int, db: Session = Depends(get_session)):
-    brotherss = db.get(Brotherss, item_id)
+async def read_brotherss(item_id: int, db: AsyncSession = Depends(get_async_session)):
+    brotherss = await db.get(Brotherss, item_id)
     if not brotherss:
         raise HTTPException(status_code=404, detail="Item not found")
     return brotherss
 
 @router.put("/{item_id}", response_model=Brotherss)
-async def update_brotherss(item_id: int, brotherss: Brotherss, db: Session = Depends(get_session)):
-    db_item = db.get(Brotherss, item_id)
+async def update_brotherss(item_id: int, brotherss: Brotherss, db: AsyncSession = Depends(get_async_session)):
+    db_item = await db.get(Brotherss, item_id)
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
     item_data = brotherss.dict(exclude_unset=True)
     for key, value in item_data.items():
         setattr(db_item, key, value)
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    await db.commit()
+    await db.refresh(db_item)
     return db_item
 
 @router.delete("/{item_id}")
-async def delete_brotherss(item_id: int, db: Session = Depends(get_session)):
-    brotherss = db.get(Brotherss, item_id)
+async def delete_brotherss(item_id: int, db: AsyncSession = Depends(get_async_session)):
+    brotherss = await db.get(Brotherss, item_id)
     if not brotherss:
         raise HTTPException(status_code=404, detail="Item not found")
-    db.delete(brotherss)
-    db.commit()
+    await db.delete(brotherss)
+    await db.commit()
     return {"message": "Item deleted successfully"}
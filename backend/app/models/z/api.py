@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlmodel import Session, select
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
 from .model import z
-from app.db import get_session
+from app.db import get_async_session
+from app.importer import IMPORT_BATCH_SIZE
+from app.routes.engine import BULK_CHUNK_SIZE
 
 router = APIRouter(
     prefix="/z",
@@ -10,42 +13,66 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=z)
-async def create_z(z: z, db: Session = Depends(get_session)):
+async def create_z(z: z, db: AsyncSession = Depends(get_async_session)):
     db.add(z)
-    db.commit()
-    db.refresh(z)
+    await db.commit()
+    await db.refresh(z)
     return z
 
+@router.post("/bulk")
+async def create_zs_bulk(request: Request, chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=10000), db: AsyncSession = Depends(get_async_session)):
+    # JSON array or NDJSON body; one multi-row INSERT and transaction per chunk
+    from app.routes.rest import core
+    return await core.bulk_insert(db, z, request, chunk_size)
+
+@router.post("/import")
+async def import_zs(request: Request, batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1), skip_unknown: bool = False):
+    # CSV body with a header row; loaded with COPY on PostgreSQL
+    from app.routes.rest import core
+    return await core.import_csv(z, request, batch_size, skip_unknown)
+
 @router.get("/", response_model=List[z])
-async def read_zs(db: Session = Depends(get_session)):
-    zs = db.exec(select(z)).all()
+async def read_zs(db: AsyncSession = Depends(get_async_session)):
+    zs = (await db.exec(select(z))).all()
     return zs
 
+@router.get("/export")
+async def export_zs(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    sort_by: Optional[str] = None,
+    sort_order: str = Query("asc", regex="^(asc|desc)$"),
+    search: Optional[str] = None,
+    filter: Optional[str] = None
+):
+    # Imported here: app.routes.rest imports this module while building Saad
+    from app.routes.rest import core
+    return core.export_items(z, format, sort_by, sort_order, search, filter)
+
 @router.get("/{item_id}", response_model=z)
-async def read_z(item_id: int, db: Session = Depends(get_session)):
-    z = db.get(z, item_id)
+async def read_z(item_id: int, db: AsyncSession = Depends(get_async_session)):
+    z = await db.get(z, item_id)
     if not z:
         raise HTTPException(status_code=404, detail="Item not found")
     return z
 
 @router.put("/{item_id}", response_model=z)
-async def update_z(item_id: int, z: z, db: Session = Depends(get_session)):
-    db_item = db.get(z, item_id)
+async def update_z(item_id: int, z: z, db: AsyncSession = Depends(get_async_session)):
+    db_item = await db.get(z, item_id)
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
     item_data = z.dict(exclude_unset=True)
     for key, value in item_data.items():
         setattr(db_item, key, value)
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    await db.commit()
+    await db.refresh(db_item)
     return db_item
 
 @router.delete("/{item_id}")
-async def delete_z(item_id: int, db: Session = Depends(get_session)):
-    z = db.get(z, item_id)
+async def delete_z(item_id: int, db: AsyncSession = Depends(get_async_session)):
+    z = await db.get(z, item_id)
     if not z:
         raise HTTPException(status_code=404, detail="Item not found")
-    db.delete(z)
-    db.commit()
+    await db.delete(z)
+    await db.commit()
     return {"message": "Item deleted successfully"}
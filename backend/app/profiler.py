@@ -0,0 +1,195 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# STARTUP_PROFILE=true records import and startup timings; the report is logged
+# once the app has started, and also written as JSON to STARTUP_PROFILE_FILE if set
+STARTUP_PROFILE = os.getenv("STARTUP_PROFILE", "false").lower() == "true"
+STARTUP_PROFILE_FILE = os.getenv("STARTUP_PROFILE_FILE")
+STARTUP_PROFILE_TOP = int(os.getenv("STARTUP_PROFILE_TOP", "25"))
+
+
+class ImportTimer(MetaPathFinder):
+    """
+    Meta path hook that times each module's execution. It defers the lookup
+    to the remaining finders, then wraps the found loader's exec_module. Self
+    time excludes nested imports, so heavy dependencies show up on their own
+    line instead of inflating whoever imported them first.
+    """
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self.profiler = profiler
+        self.local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self.local, "finding", False):
+            return None
+        self.local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self.local.finding = False
+        loader = spec.loader
+        # Builtin and frozen importers are classes shared by every module; those imports are cheap anyway
+        if loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module"):
+            loader.exec_module = self.timed(fullname, loader.exec_module)
+        return spec
+
+    def timed(self, fullname: str, exec_module):
+        def exec_and_time(module):
+            stack = self.local.__dict__.setdefault("stack", [])
+            stack.append(0.0)
+            started = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - started
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                self.profiler.imports[fullname] = {"cumulative": elapsed, "self": elapsed - nested}
+        return exec_and_time
+
+
+class StartupProfiler:
+    """Collects per-module import times and named startup sections until the app is ready."""
+
+    def __init__(self, path: Optional[str] = STARTUP_PROFILE_FILE, top: int = STARTUP_PROFILE_TOP):
+        self.path = path
+        self.top = top
+        self.enabled = False
+        self.started = time.perf_counter()
+        self.finder: Optional[ImportTimer] = None
+        self.imports: Dict[str, dict] = {}
+        self.sections: List[dict] = []
+        self.depth = 0
+        self.emitted = False
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+        self.enabled = True
+        self.started = time.perf_counter()
+        self.finder = ImportTimer(self)
+        sys.meta_path.insert(0, self.finder)
+
+    def disable(self) -> None:
+        if self.finder in sys.meta_path:
+            sys.meta_path.remove(self.finder)
+        self.enabled = False
+
+    @contextmanager
+    def section(self, name: str):
+        """Time a block of startup work; a no-op unless profiling is enabled."""
+        if not self.enabled:
+            yield
+            return
+        entry = {"name": name, "depth": self.depth, "start": time.perf_counter() - self.started}
+        self.depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            entry["seconds"] = time.perf_counter() - started
+            self.sections.append(entry)
+
+    def report(self, top: Optional[int] = None) -> dict:
+        imports = sorted(
+            ({"module": name, **timing} for name, timing in self.imports.items()),
+            key=lambda item: item["self"], reverse=True,
+        )
+        # Top-level packages, e.g. everything under emails.* or sqlalchemy.*
+        packages: Dict[str, float] = {}
+        for item in imports:
+            root = item["module"].split(".")[0]
+            packages[root] = packages.get(root, 0.0) + item["self"]
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "import_seconds": round(sum(item["self"] for item in imports), 4),
+            "modules_imported": len(imports),
+            "sections": [
+                {**section, "start": round(section["start"], 4), "seconds": round(section["seconds"], 4)}
+                for section in sorted(self.sections, key=lambda section: section["start"])
+            ],
+            "packages": [
+                {"package": name, "seconds": round(seconds, 4)}
+                for name, seconds in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+            ],
+            "modules": [
+                {"module": item["module"], "self": round(item["self"], 4), "cumulative": round(item["cumulative"], 4)}
+                for item in imports[:top]
+            ],
+        }
+
+    def emit(self) -> Optional[dict]:
+        """Log the report (and write it as JSON to self.path) once; stops timing further imports."""
+        if not self.enabled or self.emitted:
+            return None
+        self.emitted = True
+        self.disable()
+        report = self.report(self.top)
+        lines = [f"Startup took {report['total_seconds']:.3f}s, {report['import_seconds']:.3f}s importing {report['modules_imported']} modules"]
+        lines.append("Sections:")
+        lines += [f"  {section['seconds'] * 1000:9.1f} ms  {'  ' * section['depth']}{section['name']}" for section in report["sections"]]
+        lines.append("Packages (self time):")
+        lines += [f"  {item['seconds'] * 1000:9.1f} ms  {item['package']}" for item in report["packages"]]
+        lines.append("Modules (self / cumulative):")
+        lines += [f"  {item['self'] * 1000:9.1f} ms  {item['cumulative'] * 1000:9.1f} ms  {item['module']}" for item in report["modules"]]
+        logger.info("\n".join(lines))
+        if self.path:
+            with open(self.path, "w") as f:
+                json.dump(self.report(), f, indent=2)
+            logger.info(f"Startup profile written to {self.path}")
+        return report
+
+
+startup_profiler = StartupProfiler()
+if STARTUP_PROFILE:
+    startup_profiler.enable()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """python -m app.profiler [--output startup.json] [--top 25]"""
+    parser = argparse.ArgumentParser(description="Profile a cold start of the Habitly app")
+    parser.add_argument("--output", help="Write the full report as JSON to this file")
+    parser.add_argument("--top", type=int, default=STARTUP_PROFILE_TOP, help="Rows per table in the logged report")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    # Under python -m this file runs as __main__; app.main reports to the app.profiler instance
+    from app.profiler import startup_profiler as profiler
+    profiler.path = args.output
+    profiler.top = args.top
+    profiler.enable()
+    with profiler.section("import app.main"):
+        from app.main import app
+
+    async def start():
+        # Run the lifespan startup the way uvicorn would (it emits the report), then shut straight down
+        async with app.router.lifespan_context(app):
+            pass
+
+    asyncio.run(start())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,12 @@
 from typing import Annotated
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
 from app.schemas import Token, User, UserCreate, UserResponse
 from passlib.context import CryptContext
 from datetime import timedelta
-from app.db import get_session
-from sqlmodel import Session, select
+from app.db import get_async_session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from dotenv import load_dotenv
 import os
 
@@ -14,7 +15,7 @@ load_dotenv()
 
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
 
-from app.utils import authenticate_user, create_access_token, get_password_hash, send_email
+from app.utils import authenticate_user, create_access_token, get_password_hash_async, send_email
 
 
 router = APIRouter( tags=["auth"])
@@ -24,9 +25,9 @@ router = APIRouter( tags=["auth"])
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> Token:
-    user = authenticate_user(session, form_data.username, form_data.password)
+    user = await authenticate_user(session, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -40,12 +41,12 @@ async def login_for_access_token(
     return Token(access_token=access_token, token_type="bearer")
 
 @router.post("/register", response_model=UserResponse)
-def create_user(
+async def create_user(
     user_in: UserCreate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> User:
     # Check if user already exists
-    existing_user = session.exec(select(User).where(User.email == user_in.email)).first()
+    existing_user = (await session.exec(select(User).where(User.email == user_in.email))).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -53,34 +54,28 @@ def create_user(
         )
 
     # Hash the password and create the user
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash_async(user_in.password)
     user = User(
         full_name=user_in.full_name,
         email=user_in.email,
         password=hashed_password,
     )
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
+    await session.refresh(user)
     return user
 
 
 @router.post("/send-email-background")
 def send_email_background(
-    background_tasks: BackgroundTasks,
     email_to: str,
 ) -> dict:  
     subject = "Welcome Message"
     body = {"name": "Samuaek Ketema", "title": "Welcome to Habitly"}
-    body_str = f"""
-    <html>
-        <body>
-            <h1>{body['title']}</h1>
-            <p>Dear {body['name']},</p>
-            <p>Welcome to Habitly! We are excited to have you join us.</p>
-        </body>
-    </html>
-    """
-    send_email(background_tasks, subject, email_to, body_str)
-    return {"message": "Email sent successfully"}  
+    if not send_email(subject, email_to, "email.html", {"body": body}):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Mail queue is full, try again later.",
+        )
+    return {"message": "Email queued successfully"}  
 
@@ -4,80 +4,528 @@ import logging
 import sys
 import datetime
 import json
-from typing import Dict, List, Optional, Type, Generator
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query
-from sqlmodel import SQLModel, Field, Session, select, create_engine
-from app.schemas import ModelDefinition
+import threading
+import time
+import base64
+import csv
+import io
+import tempfile
+from typing import AsyncGenerator, Dict, List, Optional, Type
+from cachetools import TTLCache
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from app.advisor import INDEX_ADVISOR, WorkloadStats, index_columns, plan_nodes
+from sqlmodel import SQLModel, Field, Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.db import get_async_engine, get_engine
+from app.importer import CsvImporter, IMPORT_BATCH_SIZE, PARSERS, load_model
+from app.logs import setup_logging
+from app.profiler import startup_profiler
+from app.schemas import ModelDefinition, ModelRecord
 from app.templates.api_template import get_api_template
 from importlib import import_module
-from sqlalchemy import inspect, asc, desc
+from pydantic import ValidationError
+from sqlalchemy import Engine, Index, MetaData, Table, inspect, insert, and_, asc, bindparam, desc, func, or_, tuple_, literal_column
+from sqlalchemy.exc import DBAPIError, IntegrityError, NoSuchTableError
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import registry
 from sqlalchemy.sql import text
+from sqlalchemy.types import String
+
+# Log categories; levels are set per category with LOG_LEVELS, e.g. "saad.request=DEBUG".
+# Per-request traces are DEBUG so they cost nothing unless enabled, and are sampled when they are.
+setup_logging()
+logger = logging.getLogger("saad")
+request_log = logging.getLogger("saad.request")
+db_log = logging.getLogger("saad.db")
+model_log = logging.getLogger("saad.models")
+
+# Exact counts are cached briefly per (table, filter, search) so paging through
+# a large result set doesn't re-run COUNT(*) for every page
+COUNT_CACHE_TTL = int(os.getenv("SAAD_COUNT_CACHE_TTL", "30"))
+COUNT_CACHE_SIZE = int(os.getenv("SAAD_COUNT_CACHE_SIZE", "1024"))
+
+# Default rows per INSERT and transaction for the bulk endpoint
+BULK_CHUNK_SIZE = int(os.getenv("SAAD_BULK_CHUNK_SIZE", "1000"))
+
+# Rows fetched per round trip from the server-side cursor during exports
+EXPORT_BATCH_SIZE = int(os.getenv("SAAD_EXPORT_BATCH_SIZE", "1000"))
+
+# Uploads are buffered in memory up to this size, then spooled to disk
+IMPORT_SPOOL_SIZE = int(os.getenv("SAAD_IMPORT_SPOOL_SIZE", str(16 * 1024 * 1024)))
+# Where reject files from the import endpoint are written
+IMPORT_REJECT_DIR = os.getenv("SAAD_IMPORT_REJECT_DIR", tempfile.gettempdir())
+
+# Opt-in cache of serialized GET responses for the CRUD routers; capped by total body size
+RESPONSE_CACHE = os.getenv("SAAD_RESPONSE_CACHE", "false").lower() == "true"
+RESPONSE_CACHE_TTL = int(os.getenv("SAAD_RESPONSE_CACHE_TTL", "60"))
+RESPONSE_CACHE_BYTES = int(os.getenv("SAAD_RESPONSE_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+# Import generated model routers on the first request to their prefix rather than at startup
+LAZY_ROUTERS = os.getenv("SAAD_LAZY_ROUTERS", "true").lower() == "true"
+
+# Text search configuration for fulltext search indexes; 'simple' avoids
+# language-specific stemming since dynamic tables hold arbitrary data
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+# Operators accepted in the filter parameter, e.g. {"age": {"gte": 18}}; a bare value means eq
+FILTER_OPERATORS = ("eq", "ne", "lt", "lte", "gt", "gte", "in", "between", "is_null", "prefix")
+FILTER_DESCRIPTION = (
+    "JSON object of field filters, e.g. {\"name\": \"John\", \"age\": {\"gte\": 18, \"lt\": 65}}; "
+    f"operators: {', '.join(FILTER_OPERATORS)}"
+)
+
+# Serve every dynamic model from one /{table}/... route set instead of a router per model
+GENERIC_DISPATCH = os.getenv("SAAD_GENERIC_DISPATCH", "false").lower() == "true"
+
+# Where define_model keeps new models: "database" stores the definition in the dynamic_model
+# table and builds the model in memory; "files" generates app/models/<name>/model.py and api.py
+MODEL_STORE = os.getenv("SAAD_MODEL_STORE", "database").lower()
+# Requests for tables the generic dispatcher doesn't know reload the stored models at most once per interval
+MODEL_REFRESH_INTERVAL = int(os.getenv("SAAD_MODEL_REFRESH_INTERVAL", "30"))
+
+def compile_with_params(statement, params: dict, dialect):
+    """Compile a statement for EXPLAIN with its bind values; expanding IN lists get one placeholder per value."""
+    return statement.params(params).compile(dialect=dialect, compile_kwargs={"render_postcompile": True})
+
+
+def json_default(value):
+    """Serialize values json can't, as the JSON endpoints do: datetimes in ISO 8601, with a T."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class SizedTTLCache(TTLCache):
+    """TTLCache that counts the entries it evicts to stay under maxsize."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.evictions = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class ResponseCache:
+    """
+    Serialized JSON bodies of GET responses, keyed by (table, generation, query).
+    Writes bump the table's generation in Saad, so entries cached before a
+    write are never served again; they just age out under the TTL and size cap.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_BYTES, ttl: int = RESPONSE_CACHE_TTL):
+        self.entries = SizedTTLCache(maxsize=max_bytes, ttl=ttl, getsizeof=len)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        with self.lock:
+            body = self.entries.get(key)
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return body
+
+    def set(self, key: tuple, body: bytes) -> None:
+        if len(body) > self.entries.maxsize:
+            return
+        with self.lock:
+            self.entries[key] = body
+
+    def stats(self) -> dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.entries.currsize,
+                "max_bytes": self.entries.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.entries.evictions,
+            }
+
+
+class QueryPlan:
+    """
+    Everything read_items and export need to know about a model, worked out
+    once when its router is built. That covers the filterable and searchable
+    columns, the value coercers, and ready-made filter (one per operator),
+    search, sort and ranking expressions. Request values are supplied as bind parameters, so
+    each request only assembles prebuilt pieces. Repeated query shapes then
+    hit SQLAlchemy's compiled-statement cache.
+    """
+
+    def __init__(self, model_class: Type[SQLModel]):
+        self.model_class = model_class
+        self.table_name = model_class.__tablename__
+        self.columns = {name: getattr(model_class, name) for name in model_class.__table__.columns.keys()}
+        self.types = {name: self.field_type(model_class, name) for name in self.columns}
+        self.coercers = {name: PARSERS.get(field_type, str) for name, field_type in self.types.items()}
+        self.string_columns = [self.columns[name] for name, field_type in self.types.items() if field_type is str]
+        
+        self.nullable = {name for name, column in model_class.__table__.columns.items() if column.nullable}
+        
+        self.filters = {name: self.filter_expressions(name, column) for name, column in self.columns.items()}
+        # NULLs sort last ascending and first descending on every database, as PostgreSQL does by default,
+        # so a descending page is the exact reverse of an ascending one and keyset seeks can place them
+        self.order = {
+            name: {"asc": asc(column).nulls_last(), "desc": desc(column).nulls_first()}
+            if name in self.nullable else {"asc": asc(column), "desc": desc(column)}
+            for name, column in self.columns.items()
+        }
+        search = bindparam("search", type_=String)
+        self.search = {
+            "fulltext": literal_column("search_vector").op("@@")(func.plainto_tsquery(SEARCH_CONFIG, search)),
+            # ILIKE is served by the per-column GIN trigram indexes when they exist
+            "ilike": or_(*[column.ilike(bindparam("search_pattern", type_=String)) for column in self.string_columns])
+            if self.string_columns else None,
+        }
+        self.rank = {
+            "fulltext": func.ts_rank(literal_column("search_vector"), func.plainto_tsquery(SEARCH_CONFIG, search)),
+            "trigram": func.greatest(*[func.similarity(column, search) for column in self.string_columns])
+            if self.string_columns else None,
+        }
+        self.select_items = select(model_class)
+        self.select_count = select(func.count()).select_from(model_class)
+
+    @staticmethod
+    def field_type(model_class: Type[SQLModel], name: str) -> type:
+        field = model_class.model_fields.get(name)
+        if field is None:
+            return str
+        # Handle Optional[X] as well as X
+        args = [arg for arg in getattr(field.annotation, "__args__", ()) if arg is not type(None)]
+        return args[0] if args else field.annotation
+
+    def filter_expressions(self, name: str, column) -> dict:
+        """One predicate per filter operator, comparing the bare column so btree indexes stay usable."""
+        def param(suffix: str):
+            return bindparam(f"filter_{name}_{suffix}", type_=column.type)
+
+        expressions = {
+            "eq": column == param("eq"),
+            "ne": column != param("ne"),
+            "lt": column < param("lt"),
+            "lte": column <= param("lte"),
+            "gt": column > param("gt"),
+            "gte": column >= param("gte"),
+            "in": column.in_(bindparam(f"filter_{name}_in", type_=column.type, expanding=True)),
+            "between": column.between(param("low"), param("high")),
+            "is_null": column.is_(None),
+            "not_null": column.is_not(None),
+        }
+        if self.types[name] is str:
+            # LIKE 'abc%' can use a btree index under the C collation or text_pattern_ops
+            expressions["prefix"] = column.like(bindparam(f"filter_{name}_prefix", type_=String), escape="\\")
+        return expressions
+
+    def coerce(self, name: str, value):
+        """Convert a filter value to the column's declared type, raising 400 if it doesn't parse."""
+        if isinstance(value, (list, dict)):
+            raise HTTPException(status_code=400, detail=f"Invalid value for {name}: expected a single value")
+        try:
+            return self.coercers[name](str(value))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid value for {name}: {value!r}")
+
+    def condition(self, name: str, op: str, value) -> tuple:
+        """Return the prebuilt predicate for one filter operator and the bind values it needs."""
+        expressions = self.filters.get(name)
+        if expressions is None:
+            request_log.info("Invalid filter field", extra={"field": name})
+            raise HTTPException(status_code=400, detail=f"Invalid filter field: {name}")
+        if op == "is_null" or value is None and op in ("eq", "ne"):
+            null = value if op == "is_null" else op == "eq"
+            if not isinstance(null, bool):
+                raise HTTPException(status_code=400, detail=f"is_null for {name} must be true or false")
+            return expressions["is_null" if null else "not_null"], {}
+        if op == "in":
+            if not isinstance(value, list):
+                raise HTTPException(status_code=400, detail=f"in for {name} must be a list")
+            return expressions["in"], {f"filter_{name}_in": [self.coerce(name, item) for item in value]}
+        if op == "between":
+            if not isinstance(value, list) or len(value) != 2:
+                raise HTTPException(status_code=400, detail=f"between for {name} must be a [low, high] pair")
+            return expressions["between"], {
+                f"filter_{name}_low": self.coerce(name, value[0]),
+                f"filter_{name}_high": self.coerce(name, value[1]),
+            }
+        if op == "prefix":
+            if "prefix" not in expressions:
+                raise HTTPException(status_code=400, detail=f"prefix only applies to text fields, not {name}")
+            escaped = str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            return expressions["prefix"], {f"filter_{name}_prefix": escaped + "%"}
+        if op not in FILTER_OPERATORS:
+            raise HTTPException(status_code=400, detail=f"Invalid filter operator for {name}: {op}")
+        return expressions[op], {f"filter_{name}_{op}": self.coerce(name, value)}
+
+    def seek(self, sort_by: Optional[str], sort_order: str, last_value, last_id: int):
+        """
+        Keyset predicate for the rows after (last_value, last_id) in self.order.
+        A row value comparison is NULL when the sort value is, so nullable
+        columns spell out where NULLs sit instead of using one.
+        """
+        id_column = self.columns["id"]
+        after_id = id_column > last_id if sort_order == "asc" else id_column < last_id
+        if sort_by is None:
+            return after_id
+        column = self.columns[sort_by]
+        if sort_by not in self.nullable:
+            key, last_key = tuple_(column, id_column), tuple_(last_value, last_id)
+            return key > last_key if sort_order == "asc" else key < last_key
+        if last_value is None:
+            # Ascending, only NULLs are left; descending, the NULLs come first and every value follows them
+            ties = and_(column.is_(None), after_id)
+            return ties if sort_order == "asc" else or_(ties, column.is_not(None))
+        after_value = column > last_value if sort_order == "asc" else column < last_value
+        condition = or_(after_value, and_(column == last_value, after_id))
+        return or_(condition, column.is_(None)) if sort_order == "asc" else condition
+
+
+class LazyRouterMiddleware:
+    """
+    Includes a dynamic model's router into the app the first time a request hits its path prefix.
+    Requests for the OpenAPI schema or docs load every pending router so the schema stays complete.
+    With the database model store, a request for a prefix no route serves reloads the stored
+    models first, so tables defined on other workers are served without a restart.
+    """
+
+    def __init__(self, app, saad: "Saad", lazy: bool = True):
+        self.app = app
+        self.saad = saad
+        self.lazy = lazy
+        self.included: set = set()
+        self.lock = threading.Lock()
+        self.prefixes: set = set()
+        self.routes_seen = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            target = scope["app"]
+            path = scope["path"]
+            if path in (target.openapi_url, target.docs_url, target.redoc_url):
+                names = list(self.saad.model_modules) if self.lazy else []
+                if names:
+                    self.include(target, names)
+            elif path.count("/"):
+                name = path.split("/")[1]
+                if self.lazy and name in self.saad.model_modules and name not in self.included:
+                    self.include(target, [name])
+                elif self.saad.model_store == "database" and name not in self.route_prefixes(target):
+                    # Rate-limited by refresh_stored_models; a model it finds is included into target
+                    await run_in_threadpool(self.saad.refresh_stored_models, name)
+        await self.app(scope, receive, send)
+
+    def route_prefixes(self, target: FastAPI) -> set:
+        """First path segments of target's routes, recomputed when routes are added."""
+        if len(target.routes) != self.routes_seen:
+            self.routes_seen = len(target.routes)
+            self.prefixes = {route.path.split("/")[1] for route in target.routes if hasattr(route, "path")}
+        return self.prefixes
+
+    def include(self, target: FastAPI, names: List[str]) -> None:
+        with self.lock:
+            for name in names:
+                if name in self.included:
+                    continue
+                router = self.saad.load_router(name)
+                if router is not None:
+                    target.include_router(router)
+                    # Routes changed, so the cached schema is stale
+                    target.openapi_schema = None
+                self.included.add(name)
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
 
 class Saad(FastAPI):
-    def __init__(self, *args, db_url: str = f"postgresql+psycopg://{os.getenv('POSTGRES_USER')}:{os.getenv('POSTGRES_PASSWORD')}@{os.getenv('POSTGRES_HOST')}:{os.getenv('POSTGRES_PORT')}/{os.getenv('POSTGRES_DB')}", **kwargs):
+    def __init__(
+        self,
+        *args,
+        db_url: Optional[str] = None,
+        lazy_routers: bool = LAZY_ROUTERS,
+        response_cache: bool = RESPONSE_CACHE,
+        index_advisor: bool = INDEX_ADVISOR,
+        generic_dispatch: bool = GENERIC_DISPATCH,
+        model_store: str = MODEL_STORE,
+        **kwargs
+    ):
         super().__init__(*args, **kwargs)
-        self.engine = create_engine(db_url)
+        # Engines come from the shared registry in app.db; None means the app's DATABASE_URL
+        self.db_url = db_url
         self.dynamic_models: Dict[str, Type[SQLModel]] = {}
-        print(f"Initializing Saad with database URL: {db_url}")
-        # Ensure app/models/ is a package
-        os.makedirs("app/models", exist_ok=True)
-        init_file = "app/models/__init__.py"
-        if not os.path.exists(init_file):
-            print(f"Creating models package init file: {init_file}")
-            with open(init_file, "w") as f:
-                f.write("")
+        self.count_cache = TTLCache(maxsize=COUNT_CACHE_SIZE, ttl=COUNT_CACHE_TTL)
+        self.count_cache_lock = threading.Lock()
+        self.search_modes: Dict[str, str] = {}
+        self.query_plans: Dict[str, QueryPlan] = {}
+        # Bumped by every write to a table; part of every cache key for that table
+        self.generations: Dict[str, int] = {}
+        self.response_cache = ResponseCache() if response_cache else None
+        # Query shapes seen by list_items, for the index advisor
+        self.workload = WorkloadStats() if index_advisor else None
+        # Generated model packages by path prefix, and the routers imported from them so far
+        self.lazy_routers = lazy_routers
+        self.model_modules: Dict[str, str] = {}
+        self.loaded_routers: Dict[str, Optional[APIRouter]] = {}
+        self.router_lock = threading.Lock()
+        self.mounted_apps: List[FastAPI] = []
+        # Tables served by the generic dispatcher; None marks a generated model that failed to import
+        self.generic_dispatch = generic_dispatch
+        self.model_registry: Dict[str, Optional[Type[SQLModel]]] = {}
+        # Tables other workers defined since startup are picked up by reloading the store, at most once per interval
+        self.model_store = model_store
+        self.models_refreshed_at = 0.0
+        self.refresh_lock = threading.Lock()
+        # Table models built from stored definitions are declared on their own metadata, so a
+        # definition can never extend or replace one of the app's tables in SQLModel.metadata
+        self.dynamic_registry = registry()
+        self.dynamic_base = type("DynamicModel", (SQLModel,), {}, registry=self.dynamic_registry)
+        logger.info("Initializing Saad", extra={"db_url": db_url or "DATABASE_URL", "model_store": model_store})
+        if self.model_store == "files":
+            # Ensure app/models/ is a package
+            os.makedirs("app/models", exist_ok=True)
+            init_file = "app/models/__init__.py"
+            if not os.path.exists(init_file):
+                logger.info("Creating models package init file", extra={"path": init_file})
+                with open(init_file, "w") as f:
+                    f.write("")
         # Include existing dynamic routers at startup
-        print("Starting to include dynamic routers")
         self.include_dynamic_routers()
 
-    def get_db(self) -> Generator[Session, None, None]:
-        print("Creating new database session")
-        with Session(self.engine) as session:
+    @property
+    def engine(self) -> Engine:
+        return get_engine(self.db_url)
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        return get_async_engine(self.db_url)
+
+    async def get_db(self) -> AsyncGenerator[AsyncSession, None]:
+        db_log.debug("Creating new database session")
+        async with AsyncSession(self.async_engine, expire_on_commit=False) as session:
             yield session
 
-    def include_dynamic_routers(self):
-        """Include routers for existing models at startup."""
+    def bump_generation(self, table_name: str) -> None:
+        """Invalidate cached counts and responses for a table after a write."""
+        self.generations[table_name] = self.generations.get(table_name, 0) + 1
+
+    def cache_stats(self) -> dict:
+        return {
+            "response_cache": self.response_cache.stats() if self.response_cache else None,
+            "count_cache_entries": len(self.count_cache),
+        }
+
+    async def cached_response(self, key: tuple, handler) -> Response:
+        """Serve a JSON response from the response cache, or build it with handler() and cache it."""
+        body = self.response_cache.get(key)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+        response = JSONResponse(content=jsonable_encoder(await handler()))
+        self.response_cache.set(key, response.body)
+        return response
+
+    def discover_models(self) -> Dict[str, str]:
+        """Record the generated model packages under app/models without importing them."""
         models_dir = "app/models"
-        print(f"Checking models directory: {models_dir}")
         if not os.path.exists(models_dir):
-            logger.warning(f"Models directory {models_dir} does not exist")
-            return
-        for model_folder in os.listdir(models_dir):
+            logger.warning("Models directory does not exist", extra={"path": models_dir})
+            return self.model_modules
+        for model_folder in sorted(os.listdir(models_dir)):
             model_path = os.path.join(models_dir, model_folder)
-            print(f"Processing model folder: {model_path}")
-            if os.path.isdir(model_path) and os.path.exists(os.path.join(model_path, "__init__.py")):
-                module_name = f"app.models.{model_folder}.api"
+            if os.path.exists(os.path.join(model_path, "__init__.py")) and os.path.exists(os.path.join(model_path, "api.py")):
+                # Generated routers are prefixed with the table name, which is also the folder name
+                self.model_modules[model_folder] = f"app.models.{model_folder}.api"
+        logger.info("Found %d dynamic models", len(self.model_modules))
+        return self.model_modules
+
+    def load_router(self, name: str) -> Optional[APIRouter]:
+        """Import a model's router module once; later calls reuse it, as does an existing import elsewhere."""
+        if name in self.loaded_routers:
+            return self.loaded_routers[name]
+        with self.router_lock:
+            if name not in self.loaded_routers:
+                module_name = self.model_modules[name]
                 try:
-                    if module_name in sys.modules:
-                        print(f"Removing cached module: {module_name}")
-                        del sys.modules[module_name]
-                    print(f"Importing router module: {module_name}")
-                    router_module = import_module(module_name)
-                    self.include_router(router_module.router)
-                    logger.info(f"Successfully included router for {model_folder}")
+                    with startup_profiler.section(f"import router {name}"):
+                        self.loaded_routers[name] = import_module(module_name).router
+                    logger.info("Loaded dynamic router", extra={"model": name, "router_module": module_name})
                 except ImportError as e:
-                    logger.warning(f"Failed to include router for {model_folder}: {str(e)}")
+                    logger.warning("Failed to include dynamic router: %s", e, extra={"model": name, "router_module": module_name})
+                    self.loaded_routers[name] = None
+        return self.loaded_routers[name]
+
+    def mount_dynamic_routers(self, app: FastAPI) -> None:
+        """Serve the dynamic model routers from app, importing each on its first request when lazy."""
+        self.mounted_apps.append(app)
+        if self.generic_dispatch:
+            # Generated models are imported by resolve_model on the first request for their table
+            logger.info("Serving %d dynamic models through the generic dispatcher", len(self.model_modules))
+            app.include_router(self.create_dispatch_router())
+            return
+        if self.lazy_routers:
+            logger.info("Registering %d dynamic routers lazily", len(self.model_modules))
+            app.add_middleware(LazyRouterMiddleware, saad=self)
+            return
+        with startup_profiler.section(f"include {len(self.model_modules)} dynamic routers"):
+            for name in self.model_modules:
+                router = self.load_router(name)
+                if router is not None:
+                    app.include_router(router)
+        if self.model_store == "database":
+            # Only to pick up models stored by other workers; every generated router is already included
+            app.add_middleware(LazyRouterMiddleware, saad=self, lazy=False)
+
+    def include_dynamic_routers(self):
+        """Include routers for existing models at startup."""
+        with startup_profiler.section("include_dynamic_routers"):
+            self.discover_models()
+            self.mount_dynamic_routers(self)
 
-    def create_dynamic_model(self, model_def: ModelDefinition) -> Type[SQLModel]:
-        """Dynamically create an SQLModel class from the model definition"""
-        print(f"Creating dynamic model for: {model_def.name}")
+    def create_dynamic_model(self, model_def: ModelDefinition, table: bool = False) -> Type[SQLModel]:
+        """
+        Dynamically create an SQLModel class from the model definition.
+        With table=True it is a table model, complete with its indexes,
+        that can be served without a generated model.py.
+        """
+        model_log.info("Creating dynamic model", extra={"model": model_def.name})
         attrs = {"__annotations__": {}}
+        if table:
+            table_name = model_def.name.lower()
+            metadata = self.dynamic_registry.metadata
+            if table_name in metadata.tables:
+                # Rebuilding a stored model, or replacing a table reflected as a foreign key target
+                metadata.remove(metadata.tables[table_name])
+            for field_def in model_def.fields:
+                target = field_def.foreign_key.lower().split(".")[0] if field_def.foreign_key else None
+                if target and target != table_name and target not in metadata.tables:
+                    # Reflect the referenced table, which may be one of the app's, so the constraint resolves
+                    try:
+                        Table(target, metadata, autoload_with=self.engine)
+                    except NoSuchTableError:
+                        raise HTTPException(status_code=400, detail=f"Unknown foreign key table: {target}")
+            attrs["__tablename__"] = table_name
+            attrs["__table_args__"] = tuple(
+                Index(index_name, *[column.replace(" ", "_") for column in columns])
+                for index_name, columns in self.composite_indexes(model_def, table_name)
+            )
         
         # Ensure id field is included if not provided
         has_id_field = any(field.name.lower() == "id" for field in model_def.fields)
         if not has_id_field:
-            print("Adding default ID field")
             attrs["__annotations__"]["id"] = int
             attrs["id"] = Field(default=None, primary_key=True)
         
         for field_def in model_def.fields:
             field_name = field_def.name.replace(" ", "_")
-            print(f"Processing field: {field_name}, type: {field_def.type}")
+            model_log.debug("Processing field", extra={"field": field_name, "type": field_def.type})
             field_type = {
                 "str": str,
                 "int": int,
@@ -93,6 +541,10 @@ class Saad(FastAPI):
             field_params = {}
             if field_def.primary_key:
                 field_params["primary_key"] = True
+            if field_def.index or field_def.unique:
+                field_params["index"] = True
+            if field_def.unique:
+                field_params["unique"] = True
             if field_def.default is not None:
                 if field_def.type.lower() == "int":
                     field_params["default"] = int(field_def.default)
@@ -102,9 +554,12 @@ class Saad(FastAPI):
                     field_params["default"] = field_def.default.lower() == "true"
                 else:
                     field_params["default"] = field_def.default
+            elif not field_def.required:
+                # Without a default, model_validate (bulk, dispatcher) would still demand the field
+                field_params["default"] = None
             
             if field_def.foreign_key:
-                print(f"Adding foreign key for field {field_name}: {field_def.foreign_key}")
+                model_log.debug("Adding foreign key", extra={"field": field_name, "foreign_key": field_def.foreign_key})
                 attrs[field_name] = Field(
                     foreign_key=f"{field_def.foreign_key.lower()}", 
                     **field_params
@@ -112,175 +567,942 @@ class Saad(FastAPI):
             else:
                 attrs[field_name] = Field(**field_params)
         
+        if table:
+            return type(model_def.name, (self.dynamic_base,), attrs, table=True)
         model_class = type(model_def.name, (SQLModel,), attrs)
-        print(f"Created model class: {model_class.__name__}")
         return model_class
 
-    def parse_filter_param(self, filter_str: Optional[str]) -> Dict[str, str]:
-        """Parse filter query parameter into a dictionary."""
+    def parse_filter_param(self, filter_str: Optional[str]) -> Dict[str, dict]:
+        """
+        Parse filter query parameter into {field: {operator: value}}.
+        A bare value means equality, e.g. {"name": "John"}; an object applies
+        operators, e.g. {"age": {"gte": 18, "lt": 65}, "name": {"prefix": "Jo"}}.
+        """
         if not filter_str:
             return {}
         try:
             filter_dict = json.loads(filter_str)
-            if not isinstance(filter_dict, dict):
-                raise ValueError("Filter must be a valid JSON object")
-            return {str(k): str(v) for k, v in filter_dict.items()}
         except json.JSONDecodeError:
-            print(f"Invalid filter JSON: {filter_str}")
+            request_log.info("Invalid filter JSON", extra={"filter": filter_str})
             raise HTTPException(status_code=400, detail="Invalid filter format. Must be a valid JSON object.")
+        if not isinstance(filter_dict, dict):
+            raise HTTPException(status_code=400, detail="Invalid filter format. Must be a valid JSON object.")
+        parsed = {}
+        for key, value in filter_dict.items():
+            if isinstance(value, dict):
+                unknown = [op for op in value if op not in FILTER_OPERATORS]
+                if unknown or not value:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Invalid filter operator for {key}: {', '.join(unknown) or '(none)'}. "
+                               f"Use one of {', '.join(FILTER_OPERATORS)}"
+                    )
+                parsed[str(key)] = value
+            else:
+                parsed[str(key)] = {"eq": value}
+        return parsed
+
+    def plan_for(self, model_class: Type[SQLModel]) -> QueryPlan:
+        plan = self.query_plans.get(model_class.__tablename__)
+        if plan is None or plan.model_class is not model_class:
+            plan = self.query_plans[model_class.__tablename__] = QueryPlan(model_class)
+        return plan
+
+    def build_conditions(self, plan: QueryPlan, filter_dict: Dict[str, dict], search: Optional[str]) -> tuple:
+        """Build the WHERE predicates for the filter and search parameters, with the bind values they need."""
+        conditions, params = [], {}
+        for key, operators in filter_dict.items():
+            for op, value in operators.items():
+                condition, values = plan.condition(key, op, value)
+                conditions.append(condition)
+                params.update(values)
+        
+        # Apply search (for string fields only)
+        if search:
+            search_mode = self.search_modes.get(plan.table_name, "ilike")
+            request_log.debug("Applying search", extra={"search": search, "search_mode": search_mode})
+            if search_mode == "fulltext":
+                conditions.append(plan.search["fulltext"])
+                params["search"] = search
+            elif plan.search["ilike"] is not None:
+                conditions.append(plan.search["ilike"])
+                params["search_pattern"] = f"%{search}%"
+        return conditions, params
+
+    def search_rank(self, plan: QueryPlan, search: str, params: dict):
+        """Relevance expression for index-backed search, or None when searching with plain ILIKE."""
+        rank = plan.rank.get(self.search_modes.get(plan.table_name, "ilike"))
+        if rank is not None:
+            params["search"] = search
+        return rank
+
+    def detect_search_mode(self, table_name: str) -> str:
+        """Work out which search indexes an existing table has."""
+        if self.engine.dialect.name != "postgresql":
+            return "ilike"
+        try:
+            inspector = inspect(self.engine)
+            if any(column["name"] == "search_vector" for column in inspector.get_columns(table_name)):
+                return "fulltext"
+            if any(index["name"].endswith("_trgm") for index in inspector.get_indexes(table_name)):
+                return "trigram"
+        except Exception as e:
+            logger.warning("Could not inspect search indexes: %s", e, extra={"table": table_name})
+        return "ilike"
+
+    def create_search_index(self, table_name: str, string_columns: List[str], search_index: str) -> str:
+        """Build the requested search index over the string columns and return the resulting search mode."""
+        if search_index == "none" or not string_columns:
+            return "ilike"
+        if self.engine.dialect.name != "postgresql":
+            logger.warning("Search index %s requires PostgreSQL; falling back to ILIKE", search_index, extra={"table": table_name})
+            return "ilike"
+        
+        quote = self.engine.dialect.identifier_preparer.quote
+        try:
+            with self.engine.begin() as conn:
+                if search_index == "trigram":
+                    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+                    for column_name in string_columns:
+                        index_name = quote(f"ix_{table_name}_{column_name}_trgm")
+                        model_log.info("Creating trigram index", extra={"table": table_name, "index": index_name})
+                        conn.execute(text(
+                            f"CREATE INDEX IF NOT EXISTS {index_name} ON {quote(table_name)} "
+                            f"USING gin ({quote(column_name)} gin_trgm_ops)"
+                        ))
+                else:
+                    document = " || ' ' || ".join(f"coalesce({quote(column_name)}, '')" for column_name in string_columns)
+                    model_log.info("Creating search_vector column", extra={"table": table_name})
+                    conn.execute(text(
+                        f"ALTER TABLE {quote(table_name)} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                        f"GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, {document})) STORED"
+                    ))
+                    conn.execute(text(
+                        f"CREATE INDEX IF NOT EXISTS {quote(f'ix_{table_name}_search_vector')} "
+                        f"ON {quote(table_name)} USING gin (search_vector)"
+                    ))
+        except Exception as e:
+            # e.g. pg_trgm is not installable by this role; searches keep working through ILIKE
+            logger.warning("Failed to create %s search index: %s", search_index, e, extra={"table": table_name})
+            return "ilike"
+        return search_index
+
+    def composite_indexes(self, model_def: ModelDefinition, table_name: str) -> List[tuple]:
+        """Validate ModelDefinition.indexes and return (index name, field names) pairs."""
+        field_names = {"id"} | {field.name for field in model_def.fields}
+        indexes = []
+        for columns in model_def.indexes:
+            unknown = [column for column in columns if column not in field_names]
+            if not columns or unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Index {columns} must list existing fields" + (f"; unknown: {', '.join(unknown)}" if unknown else "")
+                )
+            indexes.append((f"ix_{table_name}_{'_'.join(columns)}", columns))
+        return indexes
+
+    def create_indexes(self, table: Table) -> None:
+        """
+        Create the table's declared indexes that the database doesn't have yet.
+        On PostgreSQL, indexes on a table that already holds rows are built
+        CONCURRENTLY so reads and writes aren't blocked while they build.
+        """
+        existing = {index["name"] for index in inspect(self.engine).get_indexes(table.name)}
+        missing = [index for index in table.indexes if index.name not in existing]
+        if not missing:
+            return
+        with self.engine.connect() as conn:
+            has_rows = conn.execute(select(literal_column("1")).select_from(table).limit(1)).first() is not None
+        
+        if not has_rows or self.engine.dialect.name != "postgresql":
+            with self.engine.begin() as conn:
+                for index in missing:
+                    model_log.info("Creating index", extra={"table": table.name, "index": index.name})
+                    index.create(conn)
+            return
+        
+        quote = self.engine.dialect.identifier_preparer.quote
+        # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for index in missing:
+                model_log.info("Creating index concurrently", extra={"table": table.name, "index": index.name})
+                index.dialect_options["postgresql"]["concurrently"] = True
+                try:
+                    index.create(conn)
+                except Exception:
+                    # A failed concurrent build (e.g. duplicates under a unique index) leaves an invalid index behind
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {quote(index.name)}"))
+                    raise
+
+    def existing_indexes(self, table_name: str) -> List[List[str]]:
+        """Column lists of the table's primary key, indexes and unique constraints."""
+        inspector = inspect(self.engine)
+        return [
+            inspector.get_pk_constraint(table_name)["constrained_columns"],
+            *[index["column_names"] for index in inspector.get_indexes(table_name)],
+            *[constraint["column_names"] for constraint in inspector.get_unique_constraints(table_name)],
+        ]
+
+    def explain_shape(self, conn, plan: QueryPlan, shape: dict) -> dict:
+        """Planner estimates for a recorded query shape, using the values of its latest request."""
+        sample = shape["sample"]
+        conditions, params = self.build_conditions(plan, sample["filter"], sample["search"])
+        query = plan.select_items.where(*conditions)
+        if shape["sort_by"] in plan.order:
+            query = query.order_by(plan.order[shape["sort_by"]]["asc"])
+        compiled = compile_with_params(query.limit(sample["page_size"]), params, self.engine.dialect)
+        explained = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+        nodes = plan_nodes(explained[0]["Plan"])
+        scans = [node for node in nodes if node.get("Relation Name") == plan.table_name]
+        return {
+            "plan": [node["Node Type"] for node in nodes],
+            "estimated_rows": scans[0]["Plan Rows"] if scans else None,
+            "seq_scan": any(node["Node Type"] == "Seq Scan" for node in scans),
+            "sort": any(node["Node Type"] in ("Sort", "Incremental Sort") for node in nodes),
+        }
+
+    def advise_indexes(self, table_name: Optional[str] = None) -> dict:
+        """
+        Rank indexes the recorded workload is missing by estimated benefit.
+        The benefit of a candidate is the time spent in its query shapes,
+        scaled by the share of the table the index would let them skip.
+        On PostgreSQL that share comes from EXPLAIN row estimates against
+        reltuples, and shapes the planner already serves from an index
+        without a sort are dropped. Elsewhere the observed time is used
+        as is, since it is an upper bound.
+        """
+        if self.workload is None:
+            raise HTTPException(status_code=404, detail="Index advisor is disabled; set SAAD_INDEX_ADVISOR=true")
+        postgres = self.engine.dialect.name == "postgresql"
+        workload = self.workload.snapshot(table_name)
+        recommendations = []
+        for table, shapes in workload.items():
+            plan = self.query_plans.get(table)
+            if plan is None:
+                continue
+            covered = self.existing_indexes(table)
+            candidates: Dict[tuple, dict] = {}
+            with self.engine.connect() as conn:
+                table_rows = conn.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+                    {"table_name": table}
+                ).scalar() if postgres else None
+                for shape in shapes:
+                    if shape["search"] and postgres and plan.string_columns and self.search_modes.get(table, "ilike") == "ilike":
+                        # Unindexed ILIKE '%term%' reads the whole table whatever the filters
+                        candidate = candidates.setdefault(("search",), {
+                            "table": table, "search_index": "trigram", "columns": [column.key for column in plan.string_columns],
+                            "queries": 0, "seconds": 0.0, "benefit_seconds": 0.0, "shapes": 0,
+                        })
+                        candidate["queries"] += shape["count"]
+                        candidate["seconds"] += shape["seconds"]
+                        candidate["benefit_seconds"] += shape["seconds"]
+                        candidate["shapes"] += 1
+                    
+                    columns = index_columns(shape["filters"], shape["sort_by"])
+                    if not columns or any(existing[:len(columns)] == columns for existing in covered):
+                        continue
+                    fraction, estimate = 1.0, None
+                    if postgres:
+                        try:
+                            estimate = self.explain_shape(conn, plan, shape)
+                        except HTTPException:
+                            # The model changed since the shape was recorded
+                            continue
+                        if not estimate["seq_scan"] and not estimate["sort"]:
+                            continue
+                        if table_rows and table_rows > 0 and estimate["estimated_rows"] is not None:
+                            needed = estimate["estimated_rows"]
+                            if shape["sort_by"] and columns[-1] == shape["sort_by"]:
+                                # Rows come out of the index in order, so the scan stops after one page
+                                needed = min(needed, shape["sample"]["page_size"])
+                            fraction = max(0.0, 1 - needed / table_rows)
+                    
+                    candidate = candidates.setdefault(tuple(columns), {
+                        "table": table, "index": f"ix_{table}_{'_'.join(columns)}", "columns": columns,
+                        "queries": 0, "seconds": 0.0, "benefit_seconds": 0.0, "shapes": 0,
+                        "table_rows": table_rows, "estimates": [],
+                    })
+                    candidate["queries"] += shape["count"]
+                    candidate["seconds"] += shape["seconds"]
+                    candidate["benefit_seconds"] += shape["seconds"] * fraction
+                    candidate["shapes"] += 1
+                    if estimate is not None:
+                        candidate["estimates"].append(estimate)
+            recommendations.extend(candidates.values())
+        
+        for candidate in recommendations:
+            candidate["seconds"] = round(candidate["seconds"], 4)
+            candidate["benefit_seconds"] = round(candidate["benefit_seconds"], 4)
+        recommendations.sort(key=lambda candidate: candidate["benefit_seconds"], reverse=True)
+        return {
+            "recommendations": recommendations,
+            "shapes_recorded": sum(len(shapes) for shapes in workload.values()),
+        }
+
+    def set_search_mode(self, table_name: str, search_mode: str) -> None:
+        """Use search_mode for a table from now on, and after restarts when its model is stored."""
+        self.search_modes[table_name] = search_mode
+        if self.model_store == "database":
+            with self.engine.begin() as conn:
+                conn.execute(ModelRecord.__table__.update().where(ModelRecord.table_name == table_name).values(search_mode=search_mode))
+
+    def apply_index(self, table_name: str, columns: List[str], search_index: Optional[str] = None) -> dict:
+        """Create an index recommended by advise_indexes, or the table's search index."""
+        plan = self.query_plans.get(table_name)
+        if plan is None:
+            raise HTTPException(status_code=404, detail=f"Unknown table: {table_name}")
+        if search_index:
+            string_columns = [column.key for column in plan.string_columns]
+            self.set_search_mode(table_name, self.create_search_index(table_name, string_columns, search_index))
+            return {"table": table_name, "search_mode": self.search_modes[table_name]}
+        
+        unknown = [column for column in columns if column not in plan.columns]
+        if not columns or unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Index {columns} must list existing fields" + (f"; unknown: {', '.join(unknown)}" if unknown else "")
+            )
+        table = Table(table_name, MetaData(), autoload_with=self.engine)
+        index = Index(f"ix_{table_name}_{'_'.join(columns)}", *[table.c[column] for column in columns])
+        try:
+            self.create_indexes(table)
+        except Exception as e:
+            model_log.exception("Index creation failed", extra={"table": table_name, "index": index.name})
+            raise HTTPException(status_code=500, detail=f"Index creation failed: {str(e)}")
+        return {"table": table_name, "index": index.name, "columns": columns}
+
+    def encode_cursor(self, sort_value, item_id: int) -> str:
+        """Encode the (sort value, id) of the last row of a page as an opaque cursor."""
+        if isinstance(sort_value, datetime.datetime):
+            sort_value = sort_value.isoformat()
+        payload = json.dumps([sort_value, item_id]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str, plan: QueryPlan, sort_by: Optional[str]) -> tuple:
+        """Decode a cursor produced by encode_cursor, coercing the sort value to the column type."""
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            sort_value, item_id = json.loads(payload)
+            if sort_value is not None and sort_by is not None:
+                sort_value = plan.coerce(sort_by, sort_value)
+            return sort_value, int(item_id)
+        except (ValueError, TypeError, HTTPException):
+            request_log.info("Invalid cursor", extra={"cursor": cursor})
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    async def count_items(
+        self,
+        db: AsyncSession,
+        plan: QueryPlan,
+        conditions: list,
+        params: dict,
+        mode: str,
+        cache_key: tuple
+    ) -> Optional[int]:
+        """Compute total_items for read_items according to the requested count mode."""
+        if mode == "none":
+            return None
+        
+        if mode == "estimate" and self.async_engine.dialect.name == "postgresql":
+            if not conditions:
+                # Unfiltered: the table statistics are good enough and cost nothing
+                estimate = (await db.exec(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+                    params={"table_name": plan.table_name}
+                )).scalar()
+            else:
+                # Filtered: ask the planner how many rows it expects the predicates to match
+                compiled = compile_with_params(plan.select_items.where(*conditions), params, self.async_engine.dialect)
+                connection = await db.connection()
+                explained = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)).scalar()
+                estimate = explained[0]["Plan"]["Plan Rows"]
+            # reltuples is -1 for tables that were never analyzed
+            if estimate is not None and estimate >= 0:
+                request_log.debug("Estimated count", extra={"table": plan.table_name, "estimate": estimate})
+                return int(estimate)
+        
+        with self.count_cache_lock:
+            cached = self.count_cache.get(cache_key)
+        if cached is not None:
+            request_log.debug("Count cache hit", extra={"table": plan.table_name})
+            return cached
+        
+        total_count = (await db.exec(plan.select_count.where(*conditions), params=params)).one()
+        with self.count_cache_lock:
+            self.count_cache[cache_key] = total_count
+        return total_count
+
+    async def iter_bulk_rows(self, request: Request):
+        """Yield (index, row) pairs from a JSON array body or an NDJSON stream."""
+        content_type = request.headers.get("content-type", "")
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            index, buffer = 0, b""
+            async for data in request.stream():
+                buffer += data
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        yield index, self.parse_bulk_line(line)
+                        index += 1
+            if buffer.strip():
+                yield index, self.parse_bulk_line(buffer)
+            return
+        
+        try:
+            rows = json.loads(await request.body())
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="Bulk body must be a JSON array or NDJSON")
+        for index, row in enumerate(rows):
+            yield index, row
+
+    def parse_bulk_line(self, line: bytes):
+        """Parse one NDJSON line; a malformed line comes back as the error so it is reported per row."""
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError as e:
+            return e
+
+    async def insert_chunk(self, db: AsyncSession, model_class: Type[SQLModel], chunk: list, ids: list, errors: list):
+        """Insert a chunk with one multi-row INSERT ... RETURNING; on failure, retry row by row to report the bad rows."""
+        statement = insert(model_class).returning(model_class.id)
+        try:
+            result = await db.exec(statement, params=[values for _, values in chunk])
+            chunk_ids = result.scalars().all()
+            await db.commit()
+            ids.extend(chunk_ids)
+            return
+        except Exception as e:
+            await db.rollback()
+            request_log.warning("Chunk insert failed, retrying rows individually: %s", e, extra={"table": model_class.__tablename__, "rows": len(chunk)})
+        
+        for index, values in chunk:
+            try:
+                result = await db.exec(statement, params=[values])
+                row_id = result.scalars().one()
+                await db.commit()
+                ids.append(row_id)
+            except Exception as e:
+                await db.rollback()
+                errors.append({"index": index, "error": str(getattr(e, "orig", e))})
+
+    def export_items(
+        self,
+        model_class: Type[SQLModel],
+        format: str = "ndjson",
+        sort_by: Optional[str] = None,
+        sort_order: str = "asc",
+        search: Optional[str] = None,
+        filter: Optional[str] = None
+    ) -> StreamingResponse:
+        """Stream every matching row as NDJSON or CSV through a server-side cursor."""
+        request_log.debug("Exporting items", extra={
+            "table": model_class.__tablename__, "format": format, "sort_by": sort_by,
+            "sort_order": sort_order, "search": search, "filter": filter
+        })
+        # Validate parameters before the response starts streaming
+        plan = self.plan_for(model_class)
+        conditions, params = self.build_conditions(plan, self.parse_filter_param(filter), search)
+        columns = list(model_class.__table__.columns)
+        query = select(*columns).where(*conditions)
+        if sort_by in plan.order:
+            query = query.order_by(plan.order[sort_by][sort_order.lower()])
+        query = query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        column_names = [column.name for column in columns]
+        
+        async def generate():
+            # The session lives inside the generator: request dependencies are
+            # already closed by the time a streaming body is sent
+            async with AsyncSession(self.async_engine) as session:
+                result = await session.stream(query, params)
+                if format == "csv":
+                    buffer = io.StringIO()
+                    writer = csv.writer(buffer)
+                    writer.writerow(column_names)
+                    yield buffer.getvalue()
+                async for rows in result.partitions():
+                    if format == "csv":
+                        buffer.seek(0)
+                        buffer.truncate()
+                        writer.writerows(rows)
+                        yield buffer.getvalue()
+                    else:
+                        yield "".join(json.dumps(dict(zip(column_names, row)), default=json_default) + "\n" for row in rows)
+        
+        media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+        return StreamingResponse(
+            generate(),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="{model_class.__tablename__}.{format}"'}
+        )
+
+    async def import_csv(
+        self,
+        model_class: Type[SQLModel],
+        request: Request,
+        batch_size: int = IMPORT_BATCH_SIZE,
+        skip_unknown: bool = False
+    ) -> Dict:
+        """Load a CSV request body into the model's table with CsvImporter and return its summary."""
+        logger.info("Importing CSV", extra={"table": model_class.__tablename__, "batch_size": batch_size, "skip_unknown": skip_unknown})
+        # Spool the upload as it arrives; the COPY itself runs on a worker thread with the sync engine
+        with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE) as upload:
+            async for data in request.stream():
+                upload.write(data)
+            upload.seek(0)
+            reject_file = os.path.join(
+                IMPORT_REJECT_DIR,
+                f"{model_class.__tablename__}-{datetime.datetime.now().strftime('%Y%m%d%H%M%S%f')}-rejects.csv"
+            )
+            importer = CsvImporter(
+                self.engine,
+                model_class,
+                batch_size=batch_size,
+                reject_file=reject_file,
+                skip_unknown=skip_unknown
+            )
+            source = io.TextIOWrapper(upload, encoding="utf-8-sig", newline="")
+            try:
+                summary = await run_in_threadpool(importer.run, source)
+            except (ValueError, UnicodeDecodeError) as e:
+                logger.info("CSV import rejected: %s", e, extra={"table": model_class.__tablename__})
+                raise HTTPException(status_code=400, detail=str(e))
+            finally:
+                source.detach()
+        self.bump_generation(model_class.__tablename__)
+        logger.info("CSV import finished", extra={
+            "table": summary["table"], "imported": summary["imported"], "rejected": summary["rejected"],
+            "seconds": summary["seconds"], "method": summary["method"]
+        })
+        return summary
+
+    async def list_items(
+        self,
+        db: AsyncSession,
+        model_class: Type[SQLModel],
+        page: int,
+        page_size: int,
+        sort_by: Optional[str],
+        sort_order: str,
+        search: Optional[str],
+        filter_dict: Dict[str, dict],
+        count: str,
+        cursor: Optional[str]
+    ) -> Dict:
+        """Run a read_items query and return the page with its pagination metadata."""
+        started = time.perf_counter()
+        plan = self.plan_for(model_class)
+        sort_order = sort_order.lower()
+        # Build the WHERE predicates once so the data and count queries share them
+        conditions, params = self.build_conditions(plan, filter_dict, search)
+        
+        # Start with base query
+        query = plan.select_items.where(*conditions)
+        
+        # Apply sorting, always tie-breaking on id so keyset pages are stable
+        sort_column = plan.columns.get(sort_by) if sort_by else None
+        if sort_column is not None:
+            query = query.order_by(plan.order[sort_by][sort_order])
+        elif search and cursor is None:
+            # Without an explicit sort, order index-backed search results by relevance
+            rank = self.search_rank(plan, search, params)
+            if rank is not None:
+                query = query.order_by(desc(rank))
+        
+        if cursor is not None:
+            # Keyset pagination: seek past the last row of the previous page
+            query = query.order_by(plan.order["id"][sort_order])
+            if cursor:
+                keyset_sort = sort_by if sort_column is not None else None
+                last_value, last_id = self.decode_cursor(cursor, plan, keyset_sort)
+                query = query.where(plan.seek(keyset_sort, sort_order, last_value, last_id))
+            query = query.limit(page_size)
+        else:
+            # Apply pagination
+            offset = (page - 1) * page_size
+            query = query.offset(offset).limit(page_size)
+        
+        # Execute query
+        items = (await db.exec(query, params=params)).all()
+        if request_log.isEnabledFor(logging.DEBUG):
+            request_log.debug("Fetched items", extra={
+                "table": model_class.__tablename__, "page": page, "page_size": page_size, "sort_by": sort_by,
+                "sort_order": sort_order, "search": search, "filter": filter_dict, "count_mode": count,
+                "cursor": cursor, "returned": len(items)
+            })
+        
+        # Get total count for pagination metadata; the generation drops cached counts after writes
+        table_name = model_class.__tablename__
+        cache_key = (table_name, self.generations.get(table_name, 0), json.dumps(filter_dict, sort_keys=True), search)
+        total_count = await self.count_items(db, plan, conditions, params, count, cache_key)
+        if self.workload is not None:
+            self.workload.record(
+                table_name, filter_dict, sort_by if sort_column is not None else None, search, page_size,
+                time.perf_counter() - started
+            )
+        
+        if cursor is not None:
+            next_cursor = None
+            if len(items) == page_size:
+                last = items[-1]
+                next_cursor = self.encode_cursor(getattr(last, sort_by) if sort_column is not None else None, last.id)
+            return {
+                "items": items,
+                "page_size": page_size,
+                "next_cursor": next_cursor,
+                "total_items": total_count
+            }
+        
+        return {
+            "items": items,
+            "page": page,
+            "page_size": page_size,
+            "total_items": total_count,
+            "total_pages": (total_count + page_size - 1) // page_size if total_count is not None else None
+        }
+
+    def prepare_model(self, model_class: Type[SQLModel]) -> None:
+        """Work out a model's search mode and query plan before serving it."""
+        if model_class.__tablename__ not in self.search_modes:
+            self.search_modes[model_class.__tablename__] = self.detect_search_mode(model_class.__tablename__)
+        self.query_plans[model_class.__tablename__] = QueryPlan(model_class)
+
+    async def save_item(self, db: AsyncSession, model_class: Type[SQLModel], item: SQLModel) -> SQLModel:
+        db.add(item)
+        await db.commit()
+        self.bump_generation(model_class.__tablename__)
+        await db.refresh(item)
+        request_log.debug("Created item", extra={"table": model_class.__tablename__, "item_id": getattr(item, "id", None)})
+        return item
+
+    async def bulk_insert(self, db: AsyncSession, model_class: Type[SQLModel], request: Request, chunk_size: int) -> Dict:
+        """Insert a JSON array or an NDJSON stream (application/x-ndjson) of rows."""
+        ids, errors = [], []
+        chunk = []
+        async for index, row in self.iter_bulk_rows(request):
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                values = model_class.model_validate(row).model_dump()
+                if values.get("id") is None:
+                    values.pop("id", None)
+                chunk.append((index, values))
+            except Exception as e:
+                errors.append({"index": index, "error": str(e)})
+            if len(chunk) >= chunk_size:
+                await self.insert_chunk(db, model_class, chunk, ids, errors)
+                chunk = []
+        if chunk:
+            await self.insert_chunk(db, model_class, chunk, ids, errors)
+        if ids:
+            self.bump_generation(model_class.__tablename__)
+        request_log.info("Bulk insert finished", extra={
+            "table": model_class.__tablename__, "chunk_size": chunk_size, "inserted": len(ids), "errors": len(errors)
+        })
+        return {"inserted": len(ids), "ids": ids, "errors": errors}
+
+    async def read_page(
+        self,
+        db: AsyncSession,
+        model_class: Type[SQLModel],
+        page: int,
+        page_size: int,
+        sort_by: Optional[str],
+        sort_order: str,
+        search: Optional[str],
+        filter: Optional[str],
+        count: str,
+        cursor: Optional[str]
+    ):
+        """read_items: list_items, served from the response cache when it is enabled."""
+        filter_dict = self.parse_filter_param(filter)
+        if self.response_cache is None:
+            return await self.list_items(db, model_class, page, page_size, sort_by, sort_order, search, filter_dict, count, cursor)
+        table_name = model_class.__tablename__
+        cache_key = (
+            table_name, self.generations.get(table_name, 0), "list", page, page_size, sort_by, sort_order,
+            search, json.dumps(filter_dict, sort_keys=True), count, cursor
+        )
+        return await self.cached_response(cache_key, lambda: self.list_items(
+            db, model_class, page, page_size, sort_by, sort_order, search, filter_dict, count, cursor
+        ))
+
+    async def read_one(self, db: AsyncSession, model_class: Type[SQLModel], item_id: int):
+        async def fetch_item():
+            item = await db.get(model_class, item_id)
+            if not item:
+                raise HTTPException(status_code=404, detail="Item not found")
+            return item
+        
+        if self.response_cache is None:
+            return await fetch_item()
+        table_name = model_class.__tablename__
+        return await self.cached_response((table_name, self.generations.get(table_name, 0), "item", item_id), fetch_item)
+
+    async def update_one(self, db: AsyncSession, model_class: Type[SQLModel], item_id: int, item: SQLModel) -> SQLModel:
+        db_item = await db.get(model_class, item_id)
+        if not db_item:
+            raise HTTPException(status_code=404, detail="Item not found")
+        item_data = item.dict(exclude_unset=True)
+        for key, value in item_data.items():
+            setattr(db_item, key, value)
+        db.add(db_item)
+        await db.commit()
+        self.bump_generation(model_class.__tablename__)
+        await db.refresh(db_item)
+        request_log.debug("Updated item", extra={"table": model_class.__tablename__, "item_id": item_id})
+        return db_item
+
+    async def delete_one(self, db: AsyncSession, model_class: Type[SQLModel], item_id: int) -> Dict:
+        item = await db.get(model_class, item_id)
+        if not item:
+            raise HTTPException(status_code=404, detail="Item not found")
+        await db.delete(item)
+        await db.commit()
+        self.bump_generation(model_class.__tablename__)
+        request_log.debug("Deleted item", extra={"table": model_class.__tablename__, "item_id": item_id})
+        return {"message": "Item deleted successfully"}
 
     def create_crud_router(self, model_class: Type[SQLModel]) -> APIRouter:
         """Generate CRUD endpoints for a given model class"""
-        print(f"Creating CRUD router for model: {model_class.__name__}")
+        logger.info("Creating CRUD router", extra={"model": model_class.__name__})
+        self.prepare_model(model_class)
         router = APIRouter(
             prefix=f"/{model_class.__tablename__}",
             tags=[model_class.__name__]
         )
         
         @router.post("/", response_model=model_class)
-        async def create_item(item: model_class, db: Session = Depends(self.get_db)):
-            print(f"Creating new item for {model_class.__name__}")
-            db.add(item)
-            db.commit()
-            db.refresh(item)
-            print(f"Created item with id: {getattr(item, 'id', 'N/A')}")
-            return item
+        async def create_item(item: model_class, db: AsyncSession = Depends(self.get_db)):
+            return await self.save_item(db, model_class, item)
+        
+        @router.post("/bulk", response_model=Dict)
+        async def create_items_bulk(
+            request: Request,
+            db: AsyncSession = Depends(self.get_db),
+            chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=10000, description="Rows per INSERT and transaction")
+        ):
+            """Insert a JSON array or an NDJSON stream (application/x-ndjson) of rows."""
+            return await self.bulk_insert(db, model_class, request, chunk_size)
+        
+        @router.post("/import", response_model=Dict)
+        async def import_items(
+            request: Request,
+            batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=1000000, description="Rows per COPY batch and transaction"),
+            skip_unknown: bool = Query(False, description="Ignore CSV columns the table doesn't have")
+        ):
+            """Import a CSV body (text/csv) with a header row naming the model's fields."""
+            return await self.import_csv(model_class, request, batch_size, skip_unknown)
         
         @router.get("/", response_model=Dict)
         async def read_items(
-            db: Session = Depends(self.get_db),
+            db: AsyncSession = Depends(self.get_db),
             page: int = Query(1, ge=1, description="Page number (1-based)"),
             page_size: int = Query(10, ge=1, le=100, description="Items per page"),
             sort_by: Optional[str] = Query(None, description="Field to sort by"),
             sort_order: str = Query("asc", regex="^(asc|desc)$", description="Sort order"),
             search: Optional[str] = Query(None, description="Search term for string fields"),
-            filter: Optional[str] = Query(None, description="JSON string of field-value pairs for filtering, e.g., {\"name\": \"John\", \"age\": \"30\"}")
+            filter: Optional[str] = Query(None, description=FILTER_DESCRIPTION),
+            count: str = Query("exact", regex="^(exact|estimate|none)$", description="How total_items is computed: exact COUNT(*), planner estimate, or none"),
+            cursor: Optional[str] = Query(None, description="Keyset pagination cursor; pass an empty value for the first page, then the returned next_cursor")
         ):
-            print(f"Fetching items for {model_class.__name__} with page={page}, page_size={page_size}, sort_by={sort_by}, sort_order={sort_order}, search={search}, filter={filter}")
-            
-            # Start with base query
-            query = select(model_class)
-            
-            # Apply filtering
-            filter_dict = self.parse_filter_param(filter)
-            if filter_dict:
-                for key, value in filter_dict.items():
-                    if hasattr(model_class, key):
-                        print(f"Applying filter: {key}={value}")
-                        query = query.where(getattr(model_class, key) == value)
-                    else:
-                        print(f"Invalid filter field: {key}")
-                        raise HTTPException(status_code=400, detail=f"Invalid filter field: {key}")
-            
-            # Apply search (for string fields only)
-            if search:
-                print(f"Applying search term: {search}")
-                search_conditions = []
-                for field_name in model_class.__annotations__:
-                    field_type = model_class.__annotations__[field_name]
-                    # Handle Optional[str] and str
-                    base_type = field_type.__args__[0] if hasattr(field_type, '__args__') else field_type
-                    if base_type is str:
-                        search_conditions.append(getattr(model_class, field_name).ilike(f"%{search}%"))
-                if search_conditions:
-                    from sqlalchemy import or_
-                    query = query.where(or_(*search_conditions))
-            
-            # Apply sorting
-            if sort_by and hasattr(model_class, sort_by):
-                print(f"Applying sorting: {sort_by} {sort_order}")
-                sort_func = asc if sort_order.lower() == "asc" else desc
-                query = query.order_by(sort_func(getattr(model_class, sort_by)))
-            
-            # Apply pagination
-            print(f"Applying pagination: page={page}, page_size={page_size}")
-            offset = (page - 1) * page_size
-            query = query.offset(offset).limit(page_size)
-            
-            # Execute query
-            items = db.exec(query).all()
-            print(f"Retrieved {len(items)} items")
-            
-            # Get total count for pagination metadata
-            count_query = select(model_class)
-            if filter_dict:
-                for key, value in filter_dict.items():
-                    if hasattr(model_class, key):
-                        count_query = count_query.where(getattr(model_class, key) == value)
-            if search:
-                search_conditions = []
-                for field_name in model_class.__annotations__:
-                    field_type = model_class.__annotations__[field_name]
-                    base_type = field_type.__args__[0] if hasattr(field_type, '__args__') else field_type
-                    if base_type is str:
-                        search_conditions.append(getattr(model_class, field_name).ilike(f"%{search}%"))
-                if search_conditions:
-                    from sqlalchemy import or_
-                    count_query = count_query.where(or_(*search_conditions))
-            total_items = db.exec(count_query).all()
-            total_count = len(total_items)
-            
-            return {
-                "items": items,
-                "page": page,
-                "page_size": page_size,
-                "total_items": total_count,
-                "total_pages": (total_count + page_size - 1) // page_size
-            }
+            return await self.read_page(db, model_class, page, page_size, sort_by, sort_order, search, filter, count, cursor)
+        
+        @router.get("/export")
+        async def export_items(
+            format: str = Query("ndjson", regex="^(ndjson|csv)$", description="Export format"),
+            sort_by: Optional[str] = Query(None, description="Field to sort by"),
+            sort_order: str = Query("asc", regex="^(asc|desc)$", description="Sort order"),
+            search: Optional[str] = Query(None, description="Search term for string fields"),
+            filter: Optional[str] = Query(None, description="JSON string of field-value pairs for filtering")
+        ):
+            return self.export_items(model_class, format, sort_by, sort_order, search, filter)
         
         @router.get("/{item_id}", response_model=model_class)
-        async def read_item(item_id: int, db: Session = Depends(self.get_db)):
-            print(f"Fetching item {item_id} for {model_class.__name__}")
-            item = db.get(model_class, item_id)
-            if not item:
-                print(f"Item {item_id} not found")
-                raise HTTPException(status_code=404, detail="Item not found")
-            return item
+        async def read_item(item_id: int, db: AsyncSession = Depends(self.get_db)):
+            return await self.read_one(db, model_class, item_id)
         
         @router.put("/{item_id}", response_model=model_class)
-        async def update_item(item_id: int, item: model_class, db: Session = Depends(self.get_db)):
-            print(f"Updating item {item_id} for {model_class.__name__}")
-            db_item = db.get(model_class, item_id)
-            if not db_item:
-                print(f"Item {item_id} not found for update")
-                raise HTTPException(status_code=404, detail="Item not found")
-            item_data = item.dict(exclude_unset=True)
-            for key, value in item_data.items():
-                setattr(db_item, key, value)
-            db.add(db_item)
-            db.commit()
-            db.refresh(db_item)
-            print(f"Updated item {item_id}")
-            return db_item
+        async def update_item(item_id: int, item: model_class, db: AsyncSession = Depends(self.get_db)):
+            return await self.update_one(db, model_class, item_id, item)
         
         @router.delete("/{item_id}")
-        async def delete_item(item_id: int, db: Session = Depends(self.get_db)):
-            print(f"Deleting item {item_id} for {model_class.__name__}")
-            item = db.get(model_class, item_id)
-            if not item:
-                print(f"Item {item_id} not found for deletion")
-                raise HTTPException(status_code=404, detail="Item not found")
-            db.delete(item)
-            db.commit()
-            print(f"Deleted item {item_id}")
-            return {"message": "Item deleted successfully"}
+        async def delete_item(item_id: int, db: AsyncSession = Depends(self.get_db)):
+            return await self.delete_one(db, model_class, item_id)
+        
+        return router
+
+    def register_model(self, model_class: Type[SQLModel]) -> None:
+        """Serve a table model through the generic dispatcher."""
+        self.prepare_model(model_class)
+        self.model_registry[model_class.__tablename__] = model_class
+
+    def import_model(self, name: str) -> Optional[Type[SQLModel]]:
+        """Import a generated model the first time the dispatcher sees its table; later calls reuse it."""
+        with self.router_lock:
+            if name not in self.model_registry:
+                try:
+                    with startup_profiler.section(f"import model {name}"):
+                        model_class = load_model(name)
+                    self.register_model(model_class)
+                    logger.info("Loaded dynamic model", extra={"model": name})
+                except (ImportError, ValueError) as e:
+                    logger.warning("Failed to load dynamic model: %s", e, extra={"model": name})
+                    self.model_registry[name] = None
+        return self.model_registry[name]
+
+    def resolve_model(self, table: str) -> Type[SQLModel]:
+        """Dependency of the generic routes: the model registered for the {table} path segment."""
+        model_class = self.model_registry.get(table)
+        if model_class is None and table in self.model_modules and table not in self.model_registry:
+            model_class = self.import_model(table)
+        if model_class is None and self.model_store == "database":
+            # Possibly defined by another worker since this one started
+            model_class = self.refresh_stored_models(table)
+        if model_class is None:
+            raise HTTPException(status_code=404, detail=f"Unknown table: {table}")
+        return model_class
+
+    def refresh_stored_models(self, table: str) -> Optional[Type[SQLModel]]:
+        """
+        Reload the stored models for a table this worker doesn't serve. Every
+        unknown name shares one reload per MODEL_REFRESH_INTERVAL, so requests
+        for random names can't turn into one registry query each.
+        """
+        if time.monotonic() - self.models_refreshed_at < MODEL_REFRESH_INTERVAL:
+            return None
+        # Another request is already reloading; it will pick the table up if it exists
+        if not self.refresh_lock.acquire(blocking=False):
+            return None
+        try:
+            if time.monotonic() - self.models_refreshed_at >= MODEL_REFRESH_INTERVAL:
+                self.load_stored_models()
+        finally:
+            self.refresh_lock.release()
+        return self.model_registry.get(table)
+
+    async def parse_item(self, request: Request, model_class: Type[SQLModel]) -> SQLModel:
+        """Validate a JSON request body against the model, as a typed body parameter would."""
+        try:
+            data = await request.json()
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+        try:
+            return model_class.model_validate(data)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+
+    def create_dispatch_router(self) -> APIRouter:
+        """
+        One set of CRUD routes for every dynamic model. The {table} path
+        segment is looked up in model_registry, a dict, so routing cost and
+        the OpenAPI schema stay the same size however many models exist.
+        """
+        router = APIRouter(tags=["dynamic models"])
+        
+        @router.post("/{table}/")
+        async def create_item(
+            request: Request,
+            model_class: Type[SQLModel] = Depends(self.resolve_model),
+            db: AsyncSession = Depends(self.get_db)
+        ):
+            return await self.save_item(db, model_class, await self.parse_item(request, model_class))
+        
+        @router.post("/{table}/bulk", response_model=Dict)
+        async def create_items_bulk(
+            request: Request,
+            model_class: Type[SQLModel] = Depends(self.resolve_model),
+            db: AsyncSession = Depends(self.get_db),
+            chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=10000, description="Rows per INSERT and transaction")
+        ):
+            """Insert a JSON array or an NDJSON stream (application/x-ndjson) of rows."""
+            return await self.bulk_insert(db, model_class, request, chunk_size)
+        
+        @router.post("/{table}/import", response_model=Dict)
+        async def import_items(
+            request: Request,
+            model_class: Type[SQLModel] = Depends(self.resolve_model),
+            batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=1000000, description="Rows per COPY batch and transaction"),
+            skip_unknown: bool = Query(False, description="Ignore CSV columns the table doesn't have")
+        ):
+            """Import a CSV body (text/csv) with a header row naming the model's fields."""
+            return await self.import_csv(model_class, request, batch_size, skip_unknown)
+        
+        @router.get("/{table}/", response_model=Dict)
+        async def read_items(
+            model_class: Type[SQLModel] = Depends(self.resolve_model),
+            db: AsyncSession = Depends(self.get_db),
+            page: int = Query(1, ge=1, description="Page number (1-based)"),
+            page_size: int = Query(10, ge=1, le=100, description="Items per page"),
+            sort_by: Optional[str] = Query(None, description="Field to sort by"),
+            sort_order: str = Query("asc", regex="^(asc|desc)$", description="Sort order"),
+            search: Optional[str] = Query(None, description="Search term for string fields"),
+            filter: Optional[str] = Query(None, description=FILTER_DESCRIPTION),
+            count: str = Query("exact", regex="^(exact|estimate|none)$", description="How total_items is computed: exact COUNT(*), planner estimate, or none"),
+            cursor: Optional[str] = Query(None, description="Keyset pagination cursor; pass an empty value for the first page, then the returned next_cursor")
+        ):
+            return await self.read_page(db, model_class, page, page_size, sort_by, sort_order, search, filter, count, cursor)
+        
+        @router.get("/{table}/export")
+        async def export_items(
+            model_class: Type[SQLModel] = Depends(self.resolve_model),
+            format: str = Query("ndjson", regex="^(ndjson|csv)$", description="Export format"),
+            sort_by: Optional[str] = Query(None, description="Field to sort by"),
+            sort_order: str = Query("asc", regex="^(asc|desc)$", description="Sort order"),
+            search: Optional[str] = Query(None, description="Search term for string fields"),
+            filter: Optional[str] = Query(None, description="JSON string of field-value pairs for filtering")
+        ):
+            return self.export_items(model_class, format, sort_by, sort_order, search, filter)
+        
+        @router.get("/{table}/{item_id}")
+        async def read_item(
+            item_id: int,
+            model_class: Type[SQLModel] = Depends(self.resolve_model),
+            db: AsyncSession = Depends(self.get_db)
+        ):
+            return await self.read_one(db, model_class, item_id)
+        
+        @router.put("/{table}/{item_id}")
+        async def update_item(
+            item_id: int,
+            request: Request,
+            model_class: Type[SQLModel] = Depends(self.resolve_model),
+            db: AsyncSession = Depends(self.get_db)
+        ):
+            return await self.update_one(db, model_class, item_id, await self.parse_item(request, model_class))
+        
+        @router.delete("/{table}/{item_id}")
+        async def delete_item(
+            item_id: int,
+            model_class: Type[SQLModel] = Depends(self.resolve_model),
+            db: AsyncSession = Depends(self.get_db)
+        ):
+            return await self.delete_one(db, model_class, item_id)
         
         return router
 
     def generate_model_file(self, model_def: ModelDefinition, model_class: Type[SQLModel]) -> str:
         """Generate the content for model.py"""
-        print(f"Generating model file for {model_def.name}")
         model_name = model_def.name
         fields = []
         
+        composite_indexes = self.composite_indexes(model_def, model_class.__tablename__)
+        if composite_indexes:
+            table_args = ", ".join(
+                f'Index("{index_name}", {", ".join(f'"{column.replace(" ", "_")}"' for column in columns)})'
+                for index_name, columns in composite_indexes
+            )
+            fields.append(f"    __table_args__ = ({table_args},)")
+            fields.append("")
+        
         has_id_field = any(field.name.lower() == "id" for field in model_def.fields)
         if not has_id_field:
-            print("Adding default ID field to model file")
             fields.append("    id: int = Field(default=None, primary_key=True)")
         
         for field_def in model_def.fields:
             field_name = field_def.name.replace(" ", "_")
-            print(f"Processing model field: {field_name}")
             field_type = field_def.type.lower()
             python_type = {
                 "str": "str",
@@ -296,6 +1518,10 @@ class Saad(FastAPI):
             field_params = []
             if field_def.primary_key:
                 field_params.append("primary_key=True")
+            if field_def.index or field_def.unique:
+                field_params.append("index=True")
+            if field_def.unique:
+                field_params.append("unique=True")
             if field_def.default is not None:
                 if field_type == "bool":
                     default_value = "True" if field_def.default.lower() == "true" else "False"
@@ -304,6 +1530,8 @@ class Saad(FastAPI):
                 else:
                     default_value = f'"{field_def.default}"'
                 field_params.append(f"default={default_value}")
+            elif not field_def.required:
+                field_params.append("default=None")
             if field_def.foreign_key:
                 field_params.append(f'foreign_key="{field_def.foreign_key}"')
             
@@ -313,47 +1541,141 @@ class Saad(FastAPI):
             field_line += ")"
             fields.append(field_line)
         
-        model_content = f"""from sqlmodel import SQLModel, Field
+        model_content = f"""from sqlalchemy import Index
+from sqlmodel import SQLModel, Field
 from typing import Optional
 from datetime import datetime
 
 class {model_name}(SQLModel, table=True):
 {chr(10).join(fields)}
 """
-        print(f"Generated model content for {model_name}")
         return model_content
 
+    def serve_model(self, model_class: Type[SQLModel]) -> None:
+        """Serve an in-memory table model from this app and every app the dynamic routers are mounted on."""
+        self.dynamic_models[model_class.__name__] = model_class
+        if self.generic_dispatch:
+            self.register_model(model_class)
+            return
+        router = self.create_crud_router(model_class)
+        for app in self.mounted_apps:
+            app.include_router(router)
+            # Routes changed, so the cached schema is stale
+            app.openapi_schema = None
+
+    def load_stored_models(self, table_name: Optional[str] = None) -> Optional[Type[SQLModel]]:
+        """
+        Build every stored model in memory from one query of the dynamic_model
+        table, without touching the filesystem or the models' own tables.
+        With table_name, load only that table's model, and return it.
+        """
+        query = select(ModelRecord)
+        if table_name is not None:
+            query = query.where(ModelRecord.table_name == table_name)
+        else:
+            self.models_refreshed_at = time.monotonic()
+        try:
+            with Session(self.engine) as session:
+                records = session.exec(query).all()
+        except DBAPIError as e:
+            # e.g. the dynamic_model migration hasn't been applied yet
+            logger.warning("Could not load stored models: %s", e, extra={"table": table_name})
+            return None
+        
+        model_class = None
+        with self.router_lock:
+            for record in records:
+                model_def = ModelDefinition.model_validate(record.definition)
+                if model_def.name in self.dynamic_models:
+                    model_class = self.dynamic_models[model_def.name]
+                    continue
+                try:
+                    model_class = self.create_dynamic_model(model_def, table=True)
+                except HTTPException as e:
+                    # e.g. a foreign key to a table that has since been dropped
+                    logger.warning("Could not build stored model: %s", e.detail, extra={"model": model_def.name})
+                    continue
+                self.search_modes[record.table_name] = record.search_mode
+                self.serve_model(model_class)
+        if table_name is None:
+            logger.info("Loaded %d stored models", len(records))
+        return model_class
+
+    def store_model(self, model_def: ModelDefinition) -> Dict:
+        """define_model for the database store: create the table, save the definition and serve it from memory."""
+        model_class = self.create_dynamic_model(model_def, table=True)
+        table = model_class.__table__
+        try:
+            # One transaction, so a failed definition leaves neither a table nor a record behind
+            with self.engine.begin() as conn:
+                model_log.info("Creating table", extra={"table": table.name, "columns": [column.name for column in table.columns]})
+                # Always a new table, so its declared indexes are created with it
+                table.create(conn)
+                conn.execute(insert(ModelRecord).values(
+                    name=model_def.name, table_name=table.name, definition=model_def.model_dump(),
+                    search_mode="ilike", created_at=datetime.datetime.utcnow()
+                ))
+        except IntegrityError:
+            self.dynamic_registry.metadata.remove(table)
+            model_log.info("Model already exists", extra={"model": model_def.name})
+            raise HTTPException(status_code=400, detail="Model already exists")
+        except Exception as e:
+            self.dynamic_registry.metadata.remove(table)
+            model_log.exception("Table creation failed", extra={"table": table.name})
+            raise HTTPException(status_code=500, detail=f"Table creation failed: {str(e)}")
+        
+        string_columns = [column.name for column in table.columns if column.name in model_class.model_fields
+                          and QueryPlan.field_type(model_class, column.name) is str]
+        search_mode = self.create_search_index(table.name, string_columns, model_def.search_index)
+        if search_mode == "ilike":
+            self.search_modes[table.name] = search_mode
+        else:
+            # The record was saved before the index existed
+            self.set_search_mode(table.name, search_mode)
+        self.serve_model(model_class)
+        
+        model_log.info("Model creation completed", extra={"model": model_def.name})
+        return {
+            "message": f"Model {model_def.name} created successfully",
+            "endpoints": f"/{table.name}",
+            "files_created": []
+        }
+
     def define_model(self, model_def: ModelDefinition):
         """Endpoint to define new models and generate files"""
-        print(f"Defining new model: {model_def.name}")
+        model_log.info("Defining new model", extra={"model": model_def.name})
         if not re.match(r"^[A-Za-z][A-Za-z0-9_]*$", model_def.name):
-            print(f"Invalid model name: {model_def.name}")
+            model_log.info("Invalid model name", extra={"model": model_def.name})
             raise HTTPException(status_code=400, detail="Model name must start with a letter and contain only letters, numbers, or underscores")
         
-        if model_def.name in self.dynamic_models:
-            print(f"Model already exists: {model_def.name}")
+        if model_def.name in self.dynamic_models or model_def.name.lower() in self.model_modules:
+            model_log.info("Model already exists", extra={"model": model_def.name})
             raise HTTPException(status_code=400, detail="Model already exists")
+        # Never adopt an existing table: it may be one of the app's own, such as user
+        table_name = model_def.name.lower()
+        if table_name in SQLModel.metadata.tables or inspect(self.engine).has_table(table_name):
+            model_log.info("Table already exists", extra={"model": model_def.name, "table": table_name})
+            raise HTTPException(status_code=400, detail=f"Table {table_name} already exists")
+        composite_indexes = self.composite_indexes(model_def, model_def.name.lower())
+        if self.model_store == "database":
+            return self.store_model(model_def)
         
         # Create the model class
         model_class = self.create_dynamic_model(model_def)
         self.dynamic_models[model_def.name] = model_class
-        print(f"Added to dynamic models: {self.dynamic_models.keys()}")
 
         # Create database table
-        print(f"Creating database table for {model_def.name}")
 
         # First ensure the model is properly configured as a table
         if not hasattr(model_class, '__tablename__'):
             model_class.__tablename__ = model_def.name.lower()
-            print(f"Set table name to: {model_class.__tablename__}")
 
         # Explicitly create the SQLAlchemy table
-        from sqlalchemy import Table, Column
+        from sqlalchemy import Column
         from sqlalchemy.types import String, Integer, Boolean, DateTime, Float
 
         # Ensure ID field exists as primary key
         if not any(field.name.lower() == "id" for field in model_def.fields):
-            print("➕ Adding default 'id' primary key column")
             columns = [
                 Column('id', Integer, primary_key=True)
             ]
@@ -372,7 +1694,6 @@ class {model_name}(SQLModel, table=True):
         # Add model fields
         for field_def in model_def.fields:
             if field_def.name.lower() == "id":
-                print("Skipping ID field as it's already handled")
                 continue
                 
             sa_type = type_map.get(field_def.type.lower(), String)
@@ -382,105 +1703,102 @@ class {model_name}(SQLModel, table=True):
                 column_args['primary_key'] = True
             if field_def.default is not None:
                 column_args['default'] = field_def.default
+            if field_def.index or field_def.unique:
+                column_args['index'] = True
+            if field_def.unique:
+                column_args['unique'] = True
             
-            print(f"Adding column: {field_def.name}, type: {sa_type}")
+            model_log.debug("Adding column", extra={"column": field_def.name, "type": sa_type.__name__})
             columns.append(Column(field_def.name, sa_type, **column_args))
 
         # Create the table
         try:
-            print("\n=== STARTING TABLE CREATION ===")
-            print(f"Model Class: {model_class}")
-            print(f"Model Fields: {model_class.__annotations__}")
+            model_log.info("Creating table", extra={"table": model_class.__tablename__, "columns": [column.name for column in columns]})
 
             # Create fresh metadata to avoid conflicts
-            from sqlalchemy import MetaData
             metadata = MetaData()
 
             # Create table directly
             table = Table(
                 model_class.__tablename__,
                 metadata,
-                *columns
+                *columns,
+                *[Index(index_name, *index_columns) for index_name, index_columns in composite_indexes]
             )
-            print(f"Created Table object: {table}")
 
-            # Create in database
+            # Create in database; define_model only gets here for a new table, so its indexes come with it
             metadata.create_all(self.engine)
-            print("Executed create_all()")
 
             # Verify
             inspector = inspect(self.engine)
             existing_tables = inspector.get_table_names()
-            print(f"Existing tables: {existing_tables}")
             
             if model_class.__tablename__ not in existing_tables:
-                print(f"Table creation failed - '{model_class.__tablename__}' not found")
                 raise RuntimeError(f"Table creation failed - '{model_class.__tablename__}' not found")
 
-            print(f"✅ Successfully created table '{model_class.__tablename__}'")
+            model_log.info("Created table", extra={"table": model_class.__tablename__})
+
+            string_columns = [field.name for field in model_def.fields if field.type.lower() == "str"]
+            self.search_modes[model_class.__tablename__] = self.create_search_index(
+                model_class.__tablename__, string_columns, model_def.search_index
+            )
 
         except Exception as e:
-            print(f"❌ Table creation failed: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            model_log.exception("Table creation failed", extra={"table": model_class.__tablename__})
             raise HTTPException(
                 status_code=500,
                 detail=f"Table creation failed: {str(e)}"
             )
 
-        # Generate CRUD endpoints
-        print(f"Generating CRUD router for {model_class.__name__}")
-        router = self.create_crud_router(model_class)
-        self.include_router(router)
-        
         # Create folder and files
         model_folder = f"app/models/{model_def.name.lower().replace(' ', '_')}"
-        print(f"Creating model folder: {model_folder}")
-        logger.info(f"Creating folder: {model_folder}")
-        self.update_routes_file(model_def.name)
+        model_log.info("Creating model folder", extra={"path": model_folder})
         os.makedirs(model_folder, exist_ok=True)
 
         # Ensure app/models/<model_name>/ is a package
         init_file = f"{model_folder}/__init__.py"
         if not os.path.exists(init_file):
-            print(f"Creating __init__.py in: {init_file}")
-            logger.info(f"Creating __init__.py in: {init_file}")
+            model_log.info("Creating __init__.py", extra={"path": init_file})
             with open(init_file, "w") as f:
                 f.write("")
         
         # Generate and write model.py
         model_content = self.generate_model_file(model_def, model_class)
         model_file_path = f"{model_folder}/model.py"
-        print(f"Writing model file: {model_file_path}")
-        logger.info(f"Writing model file: {model_file_path}")
+        model_log.info("Writing model file", extra={"path": model_file_path})
         with open(model_file_path, "w") as f:
             f.write(model_content)
         
         # Generate and write api.py using the template
         api_content = get_api_template(model_class.__name__, model_class.__tablename__)
         api_file_path = f"{model_folder}/api.py"
-        print(f"Writing api file: {api_file_path}")
-        logger.info(f"Writing api file: {api_file_path}")
+        model_log.info("Writing api file", extra={"path": api_file_path})
         with open(api_file_path, "w") as f:
             f.write(api_content)
         
-        # Dynamically include the generated router
-        module_name = f"app.models.{model_def.name.lower().replace(' ', '_')}.api"
-        print(f"Attempting to import router: {module_name}")
-        try:
-            if module_name in sys.modules:
-                print(f"Removing cached router module: {module_name}")
-                del sys.modules[module_name]
-            router_module = import_module(module_name)
-            self.include_router(router_module.router)
-            print(f"Successfully included router for {model_def.name}")
-            logger.info(f"Successfully included router for {model_def.name}")
-        except ImportError as e:
-            print(f"Failed to import router for {model_def.name}: {str(e)}")
-            logger.error(f"Failed to import router for {model_def.name}: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"Failed to include router for {model_def.name}: {str(e)}")
-        
-        print(f"Model creation completed for {model_def.name}")
+        # Register the generated router; lazily mounted apps pick it up on its first request
+        name = os.path.basename(model_folder)
+        module_name = f"app.models.{name}.api"
+        if module_name in sys.modules:
+            del sys.modules[module_name]
+        self.model_modules[name] = module_name
+        if self.generic_dispatch:
+            self.model_registry.pop(name, None)
+            if self.import_model(name) is None:
+                raise HTTPException(status_code=500, detail=f"Failed to register {model_def.name}")
+            model_log.info("Registered model with the generic dispatcher", extra={"model": model_def.name})
+        else:
+            self.loaded_routers.pop(name, None)
+            generated_router = self.load_router(name)
+            if generated_router is None:
+                model_log.error("Failed to import router", extra={"model": model_def.name, "router_module": module_name})
+                raise HTTPException(status_code=500, detail=f"Failed to include router for {model_def.name}")
+            if not self.lazy_routers:
+                for app in self.mounted_apps:
+                    app.include_router(generated_router)
+            model_log.info("Included router", extra={"model": model_def.name})
+        
+        model_log.info("Model creation completed", extra={"model": model_def.name})
         return {
             "message": f"Model {model_def.name} created successfully",
             "endpoints": f"/{model_class.__tablename__}",
@@ -489,38 +1807,3 @@ class {model_name}(SQLModel, table=True):
                 api_file_path
             ]
         }
-
-    def update_routes_file(self, model_name: str):
-        print(f"Updating routes file for model: {model_name}")
-        file_path = "app/routes/main.py"
-        import_line = f"from app.models.{model_name.lower()} import api as {model_name.lower()}"
-        include_line = f"router.include_router({model_name.lower()}.router)"
-
-        with open(file_path, "r") as file:
-            content = file.read()
-
-        if import_line not in content:
-            lines = content.splitlines()
-
-            # Find where to insert the import
-            last_import_index = max(
-                i for i, line in enumerate(lines)
-                if line.startswith("from app.models") or line.startswith("from app.routes")
-            )
-            print(f"Inserting import at line {last_import_index + 1}: {import_line}")
-            lines.insert(last_import_index + 1, import_line)
-
-            # Find where to insert the include_router
-            last_include_index = max(
-                i for i, line in enumerate(lines)
-                if line.strip().startswith("router.include_router")
-            )
-            print(f"Inserting include_router at line {last_include_index + 1}: {include_line}")
-            lines.insert(last_include_index + 1, include_line)
-
-            with open(file_path, "w") as file:
-                file.write("\n".join(lines))
-
-            print(f"✅ routes.py updated with: {model_name}")
-        else:
-            print(f"ℹ️ routes.py already includes {model_name}")
\ No newline at end of file
@@ -1,34 +1,31 @@
-from typing import Annotated
 from fastapi import Depends, APIRouter
-from fastapi.security import OAuth2PasswordBearer
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.schemas import Habit
-from app.db import get_session
+from app.db import get_async_session
 from app.crud import CRUDBase
+from app.utils import CurrentUser
 
 habit_crud = CRUDBase(Habit)
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-
 
 router = APIRouter(prefix="/habits", tags=["habits"])
 
 @router.get("/{habit_id}")
-def get_habit(token: Annotated[str, Depends(oauth2_scheme)], habit_id: int, db: Session = Depends(get_session)):
-    return habit_crud.get(db, habit_id)
+async def get_habit(current_user: CurrentUser, habit_id: int, db: AsyncSession = Depends(get_async_session)):
+    return await habit_crud.get(db, habit_id)
 
 @router.get("/")
-def get_all_habits(token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_session)):
-    return habit_crud.get_all(db)
+async def get_all_habits(current_user: CurrentUser, db: AsyncSession = Depends(get_async_session)):
+    return await habit_crud.get_all(db)
 
 @router.post("/")
-def create_habit(token: Annotated[str, Depends(oauth2_scheme)], habit: Habit, db: Session = Depends(get_session)):
-    return habit_crud.create(db, habit)
+async def create_habit(current_user: CurrentUser, habit: Habit, db: AsyncSession = Depends(get_async_session)):
+    return await habit_crud.create(db, habit)
 
 @router.put("/{habit_id}")
-def update_habit(token: Annotated[str, Depends(oauth2_scheme)], habit_id: int, habit: dict, db: Session = Depends(get_session)):
-    return habit_crud.update(db, habit_id, habit)
+async def update_habit(current_user: CurrentUser, habit_id: int, habit: dict, db: AsyncSession = Depends(get_async_session)):
+    return await habit_crud.update(db, habit_id, habit)
 
 @router.delete("/{habit_id}")
-def delete_habit(token: Annotated[str, Depends(oauth2_scheme)], habit_id: int, db: Session = Depends(get_session)):
-    return habit_crud.delete(db, habit_id)
\ No newline at end of file
+async def delete_habit(current_user: CurrentUser, habit_id: int, db: AsyncSession = Depends(get_async_session)):
+    return await habit_crud.delete(db, habit_id)
\ No newline at end of file
@@ -1,15 +1,30 @@
 from app.db import get_session
+from app.profiler import startup_profiler
 from app.routes.engine import Saad
-from app.schemas import ModelDefinition
+from app.schemas import IndexAdvice, ModelDefinition
 from fastapi import APIRouter
+from typing import Optional
 
 
 router = APIRouter(prefix="/rest", tags=["rest"])
 
-core = Saad(
-    get_session=get_session
-)
+with startup_profiler.section("Saad.__init__"):
+    core = Saad(
+        get_session=get_session
+    )
 
 @router.post("/generate-rest-api")
 def define_model(model_def: ModelDefinition):
     return core.define_model(model_def)
+
+@router.get("/cache")
+def cache_stats():
+    return core.cache_stats()
+
+@router.get("/index-advisor")
+def index_advisor(table: Optional[str] = None):
+    return core.advise_indexes(table)
+
+@router.post("/index-advisor/apply")
+def apply_index(advice: IndexAdvice):
+    return core.apply_index(advice.table, advice.columns, advice.search_index)
@@ -1,40 +1,47 @@
-from fastapi import APIRouter, HTTPException
+import base64
+from fastapi import APIRouter, HTTPException, Query
 from sqlmodel import select
-from app.db import SessionDep
+from app.db import AsyncSessionDep
 from app.crud import CRUDBase
-from app.schemas import Habit, Streak, User
-from fastapi.security import OAuth2PasswordBearer
+from app.schemas import Habit, Streak, StreakDaysBitmap, StreakEvent, User, UserActivity
 from datetime import date, datetime, timedelta
-from sqlalchemy import and_
 
 
-from app.utils import update_streak
+from app.utils import CurrentUser, apply_streak_events, update_streak
 
 streak_crud = CRUDBase(Streak)
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+# Upper bound on days_back for the activity calendar (about ten years)
+MAX_DAYS_BACK = 3660
+
+# Upper bound on events accepted by a single offline-sync batch
+MAX_BATCH_EVENTS = 5000
 
 
 router = APIRouter(prefix="/streaks", tags=["streaks"])
 
 @router.get("/{streak_id}")
-def get_streak(streak_id: int, db: SessionDep):
-    return streak_crud.get(db, streak_id)
+async def get_streak(current_user: CurrentUser, streak_id: int, db: AsyncSessionDep):
+    return await streak_crud.get(db, streak_id)
 
 
-@router.get("/streak-days/{user_id}", response_model=list[date])
-def get_user_streak_days(
+@router.get("/streak-days/{user_id}", response_model=list[date] | StreakDaysBitmap)
+async def get_user_streak_days(
+    current_user: CurrentUser,
     user_id: int,
-    db: SessionDep,
-    days_back: int = 30
+    db: AsyncSessionDep,
+    days_back: int = Query(30, ge=0, le=MAX_DAYS_BACK),
+    encoding: str = Query("dates", regex="^(dates|bitmap)$")
 ):
     """
-    Returns a list of dates where the user had at least one streak activity
-    within the specified time period (default: last 30 days)
+    Returns the dates where the user had at least one streak activity
+    within the specified time period (default: last 30 days).
+    With encoding=bitmap, returns one bit per day starting at start_date
+    (bit i of byte i // 8, least significant first), base64 encoded.
     """
     try:
         # Verify user exists
-        user = db.get(User, user_id)
+        user = await db.get(User, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
 
@@ -42,24 +49,30 @@ def get_user_streak_days(
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=days_back)
 
-        # Get all unique dates with streak activities for this user
-        statement = select(Streak.date_completed).join(Habit).where(
-            and_(
-                Habit.user_id == user_id,
-                Streak.date_completed >= start_date,
-                Streak.date_completed <= end_date
+        # Served entirely from the (user_id, day) primary key of the activity calendar
+        statement = select(UserActivity.day).where(
+            UserActivity.user_id == user_id,
+            UserActivity.day >= start_date,
+            UserActivity.day <= end_date
+        ).order_by(UserActivity.day)
+        active_days = (await db.exec(statement)).all()
+
+        if encoding == "bitmap":
+            days = days_back + 1
+            bitmap = bytearray((days + 7) // 8)
+            for day in active_days:
+                offset = (day - start_date).days
+                bitmap[offset // 8] |= 1 << (offset % 8)
+            return StreakDaysBitmap(
+                start_date=start_date,
+                days=days,
+                bitmap=base64.b64encode(bytes(bitmap)).decode()
             )
-        ).distinct()
-
-        # Correct way to handle the results
-        results = db.exec(statement)
-        streak_dates = [result.date() for result in results]
-        
-        # Remove duplicates and sort
-        unique_dates = sorted(list({d for d in streak_dates if d}))
-        
-        return unique_dates
+
+        return active_days
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -67,19 +80,42 @@ def get_user_streak_days(
         )
 
 @router.get("/")
-def get_all_streaks(db: SessionDep):
-    return streak_crud.get_all(db)
+async def get_all_streaks(current_user: CurrentUser, db: AsyncSessionDep):
+    return await streak_crud.get_all(db)
 
 @router.post("/")
-def create_streak(streak: Streak, db: SessionDep):
-    habit = db.get(Habit, streak.habit_id)
+async def create_streak(current_user: CurrentUser, streak: Streak, db: AsyncSessionDep):
+    habit = await db.get(Habit, streak.habit_id)
     if not habit:
         raise HTTPException(status_code=404, detail="Habit not found")
-    return update_streak(habit, db)
+    return await update_streak(habit, db)
+
+@router.post("/batch")
+async def create_streaks_batch(current_user: CurrentUser, events: list[StreakEvent], db: AsyncSessionDep):
+    """Apply many offline completions at once, e.g. when the PWA reconnects."""
+    if len(events) > MAX_BATCH_EVENTS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_EVENTS} events per batch")
+    return await apply_streak_events(events, current_user, db)
 
 
 
 @router.delete("/{streak_id}")
-def delete_streak(streak_id: int, db: SessionDep):
-    return streak_crud.delete(db, streak_id)
+async def delete_streak(current_user: CurrentUser, streak_id: int, db: AsyncSessionDep):
+    streak = await streak_crud.get(db, streak_id)
+    habit = await db.get(Habit, streak.habit_id)
+    day = streak.date_completed.date()
+    result = await streak_crud.delete(db, streak_id)
+
+    # Drop the calendar day if this was the user's only completion on it
+    remaining = (await db.exec(select(Streak.id).join(Habit).where(
+        Habit.user_id == habit.user_id,
+        Streak.date_completed >= day,
+        Streak.date_completed < day + timedelta(days=1)
+    ))).first()
+    if remaining is None:
+        activity = await db.get(UserActivity, (habit.user_id, day))
+        if activity:
+            await db.delete(activity)
+            await db.commit()
+    return result
 
@@ -2,9 +2,9 @@ from typing import Annotated
 from fastapi import Depends, APIRouter
 from fastapi.security import OAuth2PasswordBearer
 from app.schemas import User
-from app.db import SessionDep
+from app.db import AsyncSessionDep
 from app.crud import CRUDBase
-from app.utils import get_current_user, get_password_hash
+from app.utils import get_current_user, get_password_hash_async, invalidate_cached_user
 user_crud = CRUDBase(User)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -14,28 +14,32 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/{user_id}")
-def get_user(user_id: int, db: SessionDep):
-    return user_crud.get(db, user_id)
+async def get_user(user_id: int, db: AsyncSessionDep):
+    return await user_crud.get(db, user_id)
 
 @router.get("/")
-def get_all_users(db: SessionDep):
-    return user_crud.get_all(db)
+async def get_all_users(db: AsyncSessionDep):
+    return await user_crud.get_all(db)
 
 @router.post("/")
-def create_user(user: User, db: SessionDep):
-    hashed_password = get_password_hash(user.password)
+async def create_user(user: User, db: AsyncSessionDep):
+    hashed_password = await get_password_hash_async(user.password)
     user.password = hashed_password
-    return user_crud.create(db, user)
+    return await user_crud.create(db, user)
 
 @router.put("/{user_id}")
-def update_user(user_id: int, user: dict, db: SessionDep):
-    return user_crud.update(db, user_id, user)
+async def update_user(user_id: int, user: dict, db: AsyncSessionDep):
+    updated = await user_crud.update(db, user_id, user)
+    invalidate_cached_user(user_id)
+    return updated
 
 @router.delete("/{user_id}")
-def delete_user(user_id: int, db: SessionDep):
-    return user_crud.delete(db, user_id)
+async def delete_user(user_id: int, db: AsyncSessionDep):
+    result = await user_crud.delete(db, user_id)
+    invalidate_cached_user(user_id)
+    return result
 
 @router.post("/me")
-def get_me(db: SessionDep, token: str = Depends(oauth2_scheme)):
-    return get_current_user(token, db)
+async def get_me(db: AsyncSessionDep, token: str = Depends(oauth2_scheme)):
+    return await get_current_user(token, db)
     
\ No newline at end of file
@@ -1,5 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel
+from sqlalchemy import JSON, Index, text
 from sqlmodel import SQLModel, Field
 from typing import List, Literal
 
@@ -13,6 +14,15 @@ class User(SQLModel, table=True):
 
 
 class Habit(SQLModel, table=True):
+    # Partial index so the nightly streak reset only scans habits with a live streak
+    __table_args__ = (
+        Index(
+            "ix_habit_last_completed_date_active",
+            "last_completed_date",
+            postgresql_where=text("current_streak <> 0"),
+        ),
+    )
+
     id: int = Field(default=None, primary_key=True)
     name: str = Field(unique=True, index=True)
     description: str | None = None
@@ -23,11 +33,47 @@ class Habit(SQLModel, table=True):
 
 
 class Streak(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_streak_habit_id_date_completed", "habit_id", "date_completed"),
+    )
+
     id: int = Field(default=None, primary_key=True)
     habit_id: int = Field(foreign_key="habit.id")
     date_completed: datetime
 
 
+class UserActivity(SQLModel, table=True):
+    """One row per user per day with at least one completed habit, maintained by update_streak."""
+    __tablename__ = "user_activity"
+
+    # The (user_id, day) primary key doubles as the covering index for calendar lookups
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    day: date = Field(primary_key=True)
+
+
+class ModelRecord(SQLModel, table=True):
+    """A ModelDefinition saved by /rest/generate-rest-api; Saad rebuilds the model from it at startup."""
+    __tablename__ = "dynamic_model"
+
+    name: str = Field(primary_key=True)
+    table_name: str = Field(unique=True, index=True)
+    definition: dict = Field(sa_type=JSON)
+    # Search mode create_search_index settled on, so startup needn't inspect each table
+    search_mode: str = Field(default="ilike")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class StreakDaysBitmap(BaseModel):
+    start_date: date
+    days: int
+    bitmap: str
+
+
+class StreakEvent(BaseModel):
+    habit_id: int
+    completed_at: datetime
+
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -48,6 +94,7 @@ class UserResponse(BaseModel):
 
 #Rest api request format
 FieldType = Literal["str", "int", "float", "bool", "datetime"]
+SearchIndexType = Literal["none", "trigram", "fulltext"]
 
 class ModelFieldDefinition(BaseModel):
     name: str
@@ -56,9 +103,22 @@ class ModelFieldDefinition(BaseModel):
     default: str | None = None
     primary_key: bool = False
     foreign_key: str | None = None
+    # unique implies index; both become ix_<table>_<field>
+    index: bool = False
+    unique: bool = False
 
 
 
 class ModelDefinition(BaseModel):
     name: str
-    fields: List[ModelFieldDefinition]
\ No newline at end of file
+    fields: List[ModelFieldDefinition]
+    search_index: SearchIndexType = "none"
+    # Composite indexes, each a list of field names in index order, e.g. [["user_id", "created"]]
+    indexes: List[List[str]] = []
+
+
+class IndexAdvice(BaseModel):
+    table: str
+    # Columns of a btree index, in order; ignored when search_index is set
+    columns: List[str] = []
+    search_index: SearchIndexType | None = None
@@ -2,11 +2,14 @@ from string import Template
 
 def get_api_template(model_name: str, table_name: str) -> str:
     """Generate the API router code for a given model."""
-    template = Template("""from fastapi import APIRouter, HTTPException, Depends
-from sqlmodel import Session, select
-from typing import List
+    template = Template("""from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
 from .model import $model_name
-from app.db import get_session
+from app.db import get_async_session
+from app.importer import IMPORT_BATCH_SIZE
+from app.routes.engine import BULK_CHUNK_SIZE
 
 router = APIRouter(
     prefix="/$table_name",
@@ -14,44 +17,68 @@ router = APIRouter(
 )
 
 @router.post("/", response_model=$model_name)
-async def create_$table_name($table_name: $model_name, db: Session = Depends(get_session)):
+async def create_$table_name($table_name: $model_name, db: AsyncSession = Depends(get_async_session)):
     db.add($table_name)
-    db.commit()
-    db.refresh($table_name)
+    await db.commit()
+    await db.refresh($table_name)
     return $table_name
 
+@router.post("/bulk")
+async def create_${table_name}s_bulk(request: Request, chunk_size: int = Query(BULK_CHUNK_SIZE, ge=1, le=10000), db: AsyncSession = Depends(get_async_session)):
+    # JSON array or NDJSON body; one multi-row INSERT and transaction per chunk
+    from app.routes.rest import core
+    return await core.bulk_insert(db, $model_name, request, chunk_size)
+
+@router.post("/import")
+async def import_${table_name}s(request: Request, batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1), skip_unknown: bool = False):
+    # CSV body with a header row; loaded with COPY on PostgreSQL
+    from app.routes.rest import core
+    return await core.import_csv($model_name, request, batch_size, skip_unknown)
+
 @router.get("/", response_model=List[$model_name])
-async def read_${table_name}s(db: Session = Depends(get_session)):
-    ${table_name}s = db.exec(select($model_name)).all()
+async def read_${table_name}s(db: AsyncSession = Depends(get_async_session)):
+    ${table_name}s = (await db.exec(select($model_name))).all()
     return ${table_name}s
 
+@router.get("/export")
+async def export_${table_name}s(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$$"),
+    sort_by: Optional[str] = None,
+    sort_order: str = Query("asc", regex="^(asc|desc)$$"),
+    search: Optional[str] = None,
+    filter: Optional[str] = None
+):
+    # Imported here: app.routes.rest imports this module while building Saad
+    from app.routes.rest import core
+    return core.export_items($model_name, format, sort_by, sort_order, search, filter)
+
 @router.get("/{item_id}", response_model=$model_name)
-async def read_$table_name(item_id: int, db: Session = Depends(get_session)):
-    $table_name = db.get($model_name, item_id)
+async def read_$table_name(item_id: int, db: AsyncSession = Depends(get_async_session)):
+    $table_name = await db.get($model_name, item_id)
     if not $table_name:
         raise HTTPException(status_code=404, detail="Item not found")
     return $table_name
 
 @router.put("/{item_id}", response_model=$model_name)
-async def update_$table_name(item_id: int, $table_name: $model_name, db: Session = Depends(get_session)):
-    db_item = db.get($model_name, item_id)
+async def update_$table_name(item_id: int, $table_name: $model_name, db: AsyncSession = Depends(get_async_session)):
+    db_item = await db.get($model_name, item_id)
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
     item_data = $table_name.dict(exclude_unset=True)
     for key, value in item_data.items():
         setattr(db_item, key, value)
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    await db.commit()
+    await db.refresh(db_item)
     return db_item
 
 @router.delete("/{item_id}")
-async def delete_$table_name(item_id: int, db: Session = Depends(get_session)):
-    $table_name = db.get($model_name, item_id)
+async def delete_$table_name(item_id: int, db: AsyncSession = Depends(get_async_session)):
+    $table_name = await db.get($model_name, item_id)
     if not $table_name:
         raise HTTPException(status_code=404, detail="Item not found")
-    db.delete($table_name)
-    db.commit()
+    await db.delete($table_name)
+    await db.commit()
     return {"message": "Item deleted successfully"}
 """)
     return template.substitute(model_name=model_name, table_name=table_name)
\ No newline at end of file
@@ -1,17 +1,30 @@
 from datetime import datetime, timedelta, timezone, date
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from passlib.context import CryptContext
 import jwt
 import os
 from pydantic import BaseModel, EmailStr
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel import Session, select
-from app.schemas import Habit, Streak, User
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.schemas import Habit, Streak, StreakEvent, User, UserActivity
 from dotenv import load_dotenv
-from fastapi import BackgroundTasks, HTTPException
-from jinja2 import Template
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from cachetools import TLRUCache
+from typing import Annotated
+from app.db import AsyncSessionDep
+from app.mail import MailDispatcher, TemplateRegistry
 import emails
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 
@@ -22,8 +35,54 @@ MAIL_PORT = int(os.getenv('MAIL_PORT'))
 MAIL_SERVER = os.getenv('MAIL_SERVER')
 MAIL_FROM_NAME = os.getenv('MAIN_FROM_NAME')
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+SMTP_CONF = {
+    "host": MAIL_SERVER,
+    "port": MAIL_PORT,
+    "tls": True,  # Using TLS by default
+    "user": MAIL_USERNAME,
+    "password": MAIL_PASSWORD
+}
+
+# Shared delivery queue; workers reuse SMTP connections across messages
+mail_dispatcher = MailDispatcher(SMTP_CONF)
+email_templates = TemplateRegistry()
+
+# Resolved users are cached per token for at most this many seconds. invalidate_cached_user
+# only reaches the current process, so this also bounds how long other workers keep
+# serving a user that was changed or deleted; keep it short
+USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', '5'))
+USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '10000'))
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+# Rows per transaction for the nightly streak reset; unset runs a single UPDATE
+STREAK_RESET_CHUNK_SIZE = int(os.getenv('STREAK_RESET_CHUNK_SIZE', '0')) or None
+
+# Password hashing. min/max rounds pin the cost so hashes made with any other
+# cost are flagged by verify_and_update and rehashed on the next login
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+HASH_EXECUTOR = os.getenv('HASH_EXECUTOR', 'thread')  # "thread" or "process"
+HASH_WORKERS = int(os.getenv('HASH_WORKERS', str(os.cpu_count() or 1)))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+    bcrypt__max_rounds=BCRYPT_ROUNDS,
+)
+
+_hash_executor: Executor | None = None
+
+def get_hash_executor() -> Executor:
+    """Bounded pool that runs bcrypt off the event loop, created on first use."""
+    global _hash_executor
+    if _hash_executor is None:
+        if HASH_EXECUTOR == "process":
+            _hash_executor = ProcessPoolExecutor(max_workers=HASH_WORKERS)
+        else:
+            _hash_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+    return _hash_executor
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
@@ -31,6 +90,19 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password, also returning a new hash if the stored one uses outdated parameters."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(get_hash_executor(), get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(get_hash_executor(), verify_password, plain_password, hashed_password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await asyncio.get_running_loop().run_in_executor(get_hash_executor(), verify_and_update_password, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -41,64 +113,105 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def authenticate_user(session: Session, email: str, password: str) -> User | bool:
-    user = session.exec(select(User).where(User.email == email)).first()
+async def authenticate_user(session: AsyncSession, email: str, password: str) -> User | bool:
+    user = (await session.exec(select(User).where(User.email == email))).first()
     if not user:
         return False
-    if not verify_password(password, user.password):
+    verified, new_hash = await verify_and_update_password_async(password, user.password)
+    if not verified:
         return False
+    if new_hash:
+        # Stored hash predates the current bcrypt settings; upgrade it transparently
+        user.password = new_hash
+        session.add(user)
+        await session.commit()
     return user
 
-def send_email(background_tasks: BackgroundTasks, subject: str, email_to: str, body: str):
+def send_email(subject: str, email_to: str, template_name: str, context: dict) -> bool:
     """
-    Compose an email message using the emails library and schedule it to be sent in the background.
-    The body parameter is a string containing valid HTML.
+    Render a registered email template with the given context and queue it for delivery.
+    Returns False if the mail queue is full.
     """
     message = emails.Message(
         subject=subject,
-        html=Template(body).render(),
+        html=email_templates.render(template_name, context),
         mail_from=MAIL_FROM
     )
-    
-    smtp_conf = {
-        "host": MAIL_SERVER,
-        "port": MAIL_PORT,
-        "tls": True,  # Using TLS by default
-        "user": MAIL_USERNAME,
-        "password": MAIL_PASSWORD
-    }
-    
-    background_tasks.add_task(send_email_task, message, email_to, smtp_conf)
+    return mail_dispatcher.enqueue(message, email_to)
+
+def _user_cache_ttu(token, entry, now):
+    # Never serve a cached user past the token's own expiry
+    _, exp = entry
+    return min(now + USER_CACHE_TTL, exp)
 
-def send_email_task(message, email_to, smtp_conf):
+user_cache = TLRUCache(maxsize=USER_CACHE_SIZE, ttu=_user_cache_ttu, timer=time.time)
+user_cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+def invalidate_cached_user(user_id: int) -> None:
     """
-    Task to send an email. Catches exceptions to log errors like network connectivity issues.
+    Drop every cached token that resolves to this user, e.g. after it was updated or deleted.
+    Other worker processes keep their entries until USER_CACHE_TTL expires them.
     """
-    try:
-        response = message.send(to=email_to, smtp=smtp_conf)
-        if response.status_code != 250:
-            print(f"Failed to send email: {response.error}")
-        else:
-            print("Email sent successfully.")
-    except Exception as exc:
-        print(f"Exception occurred while sending email: {exc}")
+    for token, (user, _) in list(user_cache.items()):
+        if user.id == user_id:
+            user_cache.pop(token, None)
+            user_cache_stats["invalidations"] += 1
 
-def get_current_user(token: str, session: Session):
-    """Decodes the JWT and retrieves the current user from the database."""
+def get_user_cache_stats() -> dict:
+    lookups = user_cache_stats["hits"] + user_cache_stats["misses"]
+    return {
+        **user_cache_stats,
+        "size": len(user_cache),
+        "maxsize": user_cache.maxsize,
+        "hit_ratio": round(user_cache_stats["hits"] / lookups, 4) if lookups else 0.0,
+    }
+
+async def get_current_user(token: str, session: AsyncSession):
+    """Decodes the JWT and retrieves the current user, caching the result until the token expires."""
+    cached = user_cache.get(token)
+    if cached is not None:
+        user_cache_stats["hits"] += 1
+        return cached[0]
+    user_cache_stats["misses"] += 1
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email = payload.get("sub")
         if email is None:
             return None
-        user = session.exec(select(User).where(User.email == email)).first()
+        user = (await session.exec(select(User).where(User.email == email))).first()
+        if user and payload.get("exp"):
+            user_cache[token] = (user, payload["exp"])
         return user
     except jwt.ExpiredSignatureError:
         return None  
     except jwt.InvalidTokenError:
-        return None  
+        return None
+
+async def get_current_active_user(token: Annotated[str, Depends(oauth2_scheme)], session: AsyncSessionDep) -> User:
+    """Dependency that resolves the bearer token to a user or rejects the request."""
+    user = await get_current_user(token, session)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
 
+CurrentUser = Annotated[User, Depends(get_current_active_user)]
 
-def update_streak(habit: Habit, db: Session):
+
+def mark_active_days(user_id: int, days: list[date]):
+    """
+    INSERT of the user's activity calendar rows for days. A day some other
+    request marked first is left alone instead of failing the primary key.
+    """
+    return insert(UserActivity).values([{"user_id": user_id, "day": day} for day in days]).on_conflict_do_nothing(
+        index_elements=["user_id", "day"]
+    )
+
+
+async def update_streak(habit: Habit, db: AsyncSession):
     try:
         today = datetime.now()
 
@@ -118,29 +231,139 @@ def update_streak(habit: Habit, db: Session):
         # Add a new streak entry
         new_streak = Streak(habit_id=habit.id, date_completed=today)
         db.add(new_streak)
-        db.commit()
-        db.refresh(habit)
+
+        # Mark the day in the user's activity calendar
+        await db.exec(mark_active_days(habit.user_id, [today.date()]))
+        await db.commit()
+        await db.refresh(habit)
         return True
     except Exception as e:
-        db.rollback()  # Rollback changes if an error occurs
+        await db.rollback()  # Rollback changes if an error occurs
         raise HTTPException(status_code=500, detail=f"Error updating streak: {str(e)}")
 
 
-def reset_missed_streaks(db: Session):
-    """Check all habits and reset streaks if a day was missed"""
+def streak_runs(days: list[date]) -> tuple[int, int]:
+    """For sorted, distinct days: the length of the run of consecutive days ending at the last one, and the longest run."""
+    current = longest = 0
+    previous = None
+    for day in days:
+        current = current + 1 if previous is not None and (day - previous).days == 1 else 1
+        longest = max(longest, current)
+        previous = day
+    return current, longest
+
+
+async def apply_streak_events(events: list[StreakEvent], user: User, db: AsyncSession) -> dict:
+    """
+    Replay queued completions in one pass and one transaction.
+    Events are grouped per habit, and each day without a streak row gets one,
+    including days before the habit's last completion, e.g. offline events
+    that arrive after a later online one. Same-day duplicates and days that
+    already have a row are skipped. Streaks are then recomputed from the
+    habit's merged history.
+    """
+    try:
+        habit_ids = {event.habit_id for event in events}
+        habits = {
+            habit.id: habit
+            for habit in (await db.exec(select(Habit).where(Habit.id.in_(habit_ids), Habit.user_id == user.id))).all()
+        }
+
+        days_by_habit: dict[int, dict[date, datetime]] = {}
+        errors = []
+        skipped = 0
+        for event in events:
+            if event.habit_id not in habits:
+                errors.append({"habit_id": event.habit_id, "error": "Habit not found"})
+                continue
+            completed_at = event.completed_at
+            if completed_at.tzinfo is not None:
+                completed_at = completed_at.astimezone().replace(tzinfo=None)
+            # Keep the first completion of each day
+            days = days_by_habit.setdefault(event.habit_id, {})
+            day = completed_at.date()
+            if day in days:
+                skipped += 1
+                days[day] = min(days[day], completed_at)
+            else:
+                days[day] = completed_at
+
+        active_days: set[date] = set()
+        # Days each habit already has a streak row for, in one query
+        history: dict[int, set[date]] = {habit_id: set() for habit_id in days_by_habit}
+        if days_by_habit:
+            rows = await db.exec(select(Streak.habit_id, Streak.date_completed).where(Streak.habit_id.in_(days_by_habit)))
+            for habit_id, completed_at in rows.all():
+                history[habit_id].add(completed_at.date())
+
+        yesterday = date.today() - timedelta(days=1)
+        results = []
+        logged_total = 0
+        for habit_id, days in days_by_habit.items():
+            habit = habits[habit_id]
+            new_days = [day for day in sorted(days) if day not in history[habit_id]]
+            skipped += len(days) - len(new_days)
+            for day in new_days:
+                db.add(Streak(habit_id=habit.id, date_completed=days[day]))
+                active_days.add(day)
+            logged = len(new_days)
+            if logged:
+                current, longest = streak_runs(sorted(history[habit_id].union(new_days)))
+                # A run that ended before yesterday has already been broken, as reset_missed_streaks would find
+                last_day = max(history[habit_id].union(new_days))
+                habit.current_streak = current if last_day >= yesterday else 0
+                habit.max_streak = max(habit.max_streak, longest)
+                latest = days[new_days[-1]]
+                if habit.last_completed_date is None or latest > habit.last_completed_date:
+                    habit.last_completed_date = latest
+                db.add(habit)
+            logged_total += logged
+            results.append({
+                "habit_id": habit.id,
+                "current_streak": habit.current_streak,
+                "max_streak": habit.max_streak,
+                "logged": logged,
+            })
+
+        if active_days:
+            await db.exec(mark_active_days(user.id, sorted(active_days)))
+        await db.commit()
+        return {"habits": results, "logged": logged_total, "skipped": skipped, "errors": errors}
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error applying streak batch: {str(e)}")
+
+
+def reset_missed_streaks(db: Session, chunk_size: int | None = STREAK_RESET_CHUNK_SIZE) -> dict:
+    """
+    Reset the current streak of every habit that missed a day.
+    Runs as a set-based UPDATE; with chunk_size, updates at most that many rows
+    per transaction so a huge habit table is never locked all at once.
+    """
+    started = time.perf_counter()
+    rows = 0
     try:
-        today = date.today()
-        habits = db.exec(select(Habit)).all()
-        
-        for habit in habits:
-            if habit.last_completed_date:
-                days_since_last = (today - habit.last_completed_date.date()).days
-                if days_since_last > 1:  # More than one day missed
-                    habit.current_streak = 0
-                    db.add(habit)
-        
-        db.commit()
-        print("Daily streak reset check completed")
+        # Anything last completed before the start of yesterday has missed at least one day
+        yesterday = datetime.combine(date.today() - timedelta(days=1), datetime.min.time())
+        stale = (Habit.last_completed_date < yesterday, Habit.current_streak != 0)
+
+        if chunk_size:
+            while True:
+                stale_ids = select(Habit.id).where(*stale).limit(chunk_size).scalar_subquery()
+                result = db.exec(update(Habit).where(Habit.id.in_(stale_ids)).values(current_streak=0))
+                db.commit()
+                rows += result.rowcount
+                if result.rowcount < chunk_size:
+                    break
+        else:
+            result = db.exec(update(Habit).where(*stale).values(current_streak=0))
+            db.commit()
+            rows = result.rowcount
+
+        duration = time.perf_counter() - started
+        logger.info("Daily streak reset completed", extra={"rows": rows, "seconds": round(duration, 3)})
+        return {"rows": rows, "duration": duration}
     except Exception as e:
         db.rollback()
-        print(f"Error in streak reset scheduler: {str(e)}")
+        logger.exception("Error in streak reset scheduler")
+        return {"rows": rows, "duration": time.perf_counter() - started, "error": str(e)}
@@ -0,0 +1,92 @@
+"""
+Rows per second loaded through POST /{table}/bulk at several chunk sizes,
+as a JSON array and as NDJSON, against one single-row POST /{table}/ per
+row as before the bulk endpoint.
+
+    python -m benchmarks.bulk_insert --rows 100000 --chunk-sizes 100 1000 5000
+
+The single-row baseline is slow, so it only loads --single-rows rows.
+Requests go through TestClient in process, and the table is recreated
+empty before each run.
+"""
+import json
+import sys
+import time
+from typing import List, Optional
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlmodel import Field, SQLModel
+
+from app.routes.engine import Saad
+from benchmarks.common import create_table, make_parser, print_table
+
+
+class BenchBulkItem(SQLModel, table=True):
+    __tablename__ = "bench_bulk_item"
+
+    id: int | None = Field(default=None, primary_key=True)
+    category: int
+    name: str
+    score: float
+
+
+def make_rows(count: int) -> List[dict]:
+    return [{"category": i % 100, "name": f"item {i}", "score": i / 7} for i in range(count)]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = make_parser("Rows per second through the bulk endpoint vs single-row POST")
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows per bulk run")
+    parser.add_argument("--single-rows", type=int, default=2_000, help="Rows for the single-row POST baseline")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    args = parser.parse_args(argv)
+
+    saad = Saad(db_url=args.database_url)
+    table = BenchBulkItem.__table__
+    saad.include_router(saad.create_crud_router(BenchBulkItem))
+    client = TestClient(saad)
+    url = f"/{table.name}"
+
+    def timed(label: str, chunk_size, count: int, send) -> dict:
+        create_table(saad.engine, table)
+        started = time.perf_counter()
+        send()
+        elapsed = time.perf_counter() - started
+        with saad.engine.connect() as conn:
+            assert conn.execute(select(func.count()).select_from(table)).scalar() == count
+        return {
+            "endpoint": label,
+            "chunk_size": chunk_size,
+            "rows": count,
+            "seconds": round(elapsed, 2),
+            "rows_per_s": round(count / elapsed),
+        }
+
+    def single_rows():
+        for row in make_rows(args.single_rows):
+            client.post(f"{url}/", json=row).raise_for_status()
+
+    def bulk(body: str, content_type: str, chunk_size: int):
+        response = client.post(f"{url}/bulk", content=body, headers={"content-type": content_type}, params={"chunk_size": chunk_size})
+        response.raise_for_status()
+        assert not response.json()["errors"]
+
+    rows = make_rows(args.rows)
+    array_body = json.dumps(rows)
+    ndjson_body = "".join(json.dumps(row) + "\n" for row in rows)
+
+    results = [timed("POST / per row (before)", "-", args.single_rows, single_rows)]
+    for chunk_size in args.chunk_sizes:
+        results.append(timed("bulk, JSON array", chunk_size, args.rows, lambda: bulk(array_body, "application/json", chunk_size)))
+    for chunk_size in args.chunk_sizes:
+        results.append(timed("bulk, NDJSON", chunk_size, args.rows, lambda: bulk(ndjson_body, "application/x-ndjson", chunk_size)))
+
+    print_table(results)
+    if not args.keep:
+        table.drop(saad.engine)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import argparse
+import statistics
+import time
+from typing import Callable, List, Optional
+
+from sqlalchemy import Engine, Table, text
+
+
+def make_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--database-url", help="Defaults to the app's DATABASE_URL; the benchmarks expect PostgreSQL")
+    parser.add_argument("--keep", action="store_true", help="Leave the benchmark table in place afterwards")
+    return parser
+
+
+def measure(fn: Callable[[], object], repeat: int) -> dict:
+    """Call fn repeat times and summarize the wall-clock latency in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "runs": repeat,
+        "median_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+        "min_ms": round(timings[0], 2),
+    }
+
+
+def print_table(rows: List[dict]) -> None:
+    """Print a list of result dicts as an aligned text table."""
+    if not rows:
+        return
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    widths = {column: max(len(column), *(len(str(row.get(column, ""))) for row in rows)) for column in columns}
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    print("  ".join("-" * widths[column] for column in columns))
+    for row in rows:
+        print("  ".join(str(row.get(column, "")).ljust(widths[column]) for column in columns))
+
+
+def create_table(engine: Engine, table: Table, rows: int = 0, values_sql: Optional[str] = None) -> None:
+    """
+    Recreate a benchmark table and fill it server-side with rows numbered
+    i = 1..rows, where values_sql is a SELECT list over i giving the non-id
+    columns in table order. The table is analyzed afterwards so planner
+    estimates reflect the data.
+    """
+    table.drop(engine, checkfirst=True)
+    table.create(engine)
+    if not rows:
+        return
+    columns = ", ".join(column.name for column in table.columns if column.name != "id")
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"INSERT INTO {table.name} ({columns}) "
+            f"WITH RECURSIVE series(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM series WHERE i < :rows) "
+            f"SELECT {values_sql} FROM series"
+        ), {"rows": rows})
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"ANALYZE {table.name}"))
+    print(f"Seeded {rows} rows into {table.name} in {time.perf_counter() - started:.1f}s")
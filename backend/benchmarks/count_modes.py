@@ -0,0 +1,80 @@
+"""
+Page latency of read_items on a large table for each count mode, against
+the previous behaviour of loading every matching row to count it.
+
+    python -m benchmarks.count_modes --rows 1000000
+
+The count modes are timed through the HTTP route, with TestClient in
+process. The "load all rows" baseline only runs its two ORM queries, so it
+excludes the HTTP overhead the other rows include.
+"""
+import json
+import sys
+from typing import List, Optional
+
+from fastapi.testclient import TestClient
+from sqlmodel import Field, Session, SQLModel, select
+
+from app.routes.engine import Saad
+from benchmarks.common import create_table, make_parser, measure, print_table
+
+
+class BenchCountItem(SQLModel, table=True):
+    __tablename__ = "bench_count_item"
+
+    id: int | None = Field(default=None, primary_key=True)
+    category: int = Field(index=True)
+    name: str
+    score: float
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = make_parser("Page latency of read_items by count mode")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20, help="Requests per count mode")
+    parser.add_argument("--baseline-repeat", type=int, default=3, help="Runs of the load-all-rows baseline")
+    args = parser.parse_args(argv)
+
+    saad = Saad(db_url=args.database_url)
+    table = BenchCountItem.__table__
+    # 100 categories, so the filtered case matches 1% of the table
+    create_table(saad.engine, table, args.rows, "i % 100, 'item ' || i, random()")
+    saad.include_router(saad.create_crud_router(BenchCountItem))
+    client = TestClient(saad)
+
+    results = []
+    for label, filter_dict in (("none", None), ("category = 7", {"category": 7})):
+        def load_all_rows():
+            # What read_items did before count modes: the page, then every matching row for len()
+            with Session(saad.engine) as session:
+                query = select(BenchCountItem)
+                if filter_dict:
+                    query = query.where(BenchCountItem.category == 7)
+                session.exec(query.offset(0).limit(10)).all()
+                len(session.exec(query).all())
+
+        results.append({"filter": label, "count": "load all rows (before)", **measure(load_all_rows, args.baseline_repeat)})
+
+        params = {"filter": json.dumps(filter_dict)} if filter_dict else {}
+        for mode, cached in (("exact", False), ("exact", True), ("estimate", False), ("none", False)):
+            def page():
+                if not cached:
+                    saad.count_cache.clear()
+                response = client.get(f"/{table.name}/", params={**params, "count": mode})
+                response.raise_for_status()
+
+            page()
+            results.append({
+                "filter": label,
+                "count": f"{mode} (cached)" if cached else mode,
+                **measure(page, args.repeat),
+            })
+
+    print_table(results)
+    if not args.keep:
+        table.drop(saad.engine)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Whether one slow query stalls unrelated requests. A handler that runs a
+blocking Session query inside async def, as the routes did before the
+async engine, is compared with the same query on an AsyncSession.
+
+    python -m benchmarks.event_loop --pings 20
+
+While the slow request is in flight, pings to a route that doesn't touch
+the database are sent at a fixed interval. Latency is measured from each
+ping's scheduled send time, so time spent waiting for a blocked event loop
+counts against it.
+"""
+import asyncio
+import statistics
+import sys
+import time
+from typing import List, Optional
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.db import get_async_engine, get_engine
+from benchmarks.common import make_parser, print_table
+
+
+def build_app(database_url: Optional[str], slow_sql: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/slow/blocking")
+    async def slow_blocking():
+        with Session(get_engine(database_url)) as session:
+            session.exec(text(slow_sql)).all()
+        return {}
+
+    @app.get("/slow/async")
+    async def slow_async():
+        async with AsyncSession(get_async_engine(database_url)) as session:
+            (await session.exec(text(slow_sql))).all()
+        return {}
+
+    @app.get("/ping")
+    async def ping():
+        return {}
+
+    return app
+
+
+async def run(app: FastAPI, kind: str, pings: int, interval: float) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        started = time.perf_counter()
+
+        async def ping(index: int) -> float:
+            scheduled = started + 0.05 + index * interval
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            (await client.get("/ping")).raise_for_status()
+            return (time.perf_counter() - scheduled) * 1000
+
+        slow = asyncio.create_task(client.get(f"/slow/{kind}"))
+        latencies = sorted(await asyncio.gather(*[ping(index) for index in range(pings)]))
+        (await slow).raise_for_status()
+        return {
+            "slow query": kind,
+            "slow_ms": round((time.perf_counter() - started) * 1000, 1),
+            "pings": pings,
+            "ping_median_ms": round(statistics.median(latencies), 2),
+            "ping_max_ms": round(latencies[-1], 2),
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = make_parser("Latency of unrelated requests while one slow query runs")
+    parser.add_argument("--slow-sql", default="SELECT pg_sleep(1)", help="Query the slow route runs")
+    parser.add_argument("--pings", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.025, help="Seconds between pings")
+    args = parser.parse_args(argv)
+
+    app = build_app(args.database_url, args.slow_sql)
+    # Warm both pools so connection setup isn't part of the first run
+    with get_engine(args.database_url).connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    async def run_all() -> List[dict]:
+        # One event loop for everything: pooled async connections are bound to the loop that opened them
+        async_engine = get_async_engine(args.database_url)
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        try:
+            return [await run(app, kind, args.pings, args.interval) for kind in ("blocking", "async")]
+        finally:
+            await async_engine.dispose()
+
+    print_table(asyncio.run(run_all()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Export throughput and memory of GET /{table}/export as NDJSON and CSV,
+against loading the whole table with .all() and serializing one JSON body,
+as the generated read_<table>s routes did.
+
+    python -m benchmarks.export --rows 1000000
+
+The streaming body is drained straight from export_items, since
+TestClient buffers the whole response. rss_growth_mb is the rise in the
+process's peak RSS during the run; the peak only ever goes up, so the
+materializing baseline runs last.
+"""
+import asyncio
+import json
+import resource
+import sys
+import time
+from typing import List, Optional
+
+from sqlmodel import Field, Session, SQLModel, select
+
+from app.routes.engine import Saad
+from benchmarks.common import create_table, make_parser, print_table
+
+
+class BenchExportItem(SQLModel, table=True):
+    __tablename__ = "bench_export_item"
+
+    id: int | None = Field(default=None, primary_key=True)
+    category: int
+    name: str
+    score: float
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def summarize(label: str, rows: int, size: int, elapsed: float, rss_before: float) -> dict:
+    return {
+        "export": label,
+        "rows": rows,
+        "seconds": round(elapsed, 2),
+        "rows_per_s": round(rows / elapsed),
+        "mb_per_s": round(size / elapsed / 1e6, 1),
+        "rss_growth_mb": round(peak_rss_mb() - rss_before, 1),
+    }
+
+
+async def stream(saad: Saad, rows: int, formats: List[str]) -> List[dict]:
+    results = []
+    try:
+        for format in formats:
+            rss_before = peak_rss_mb()
+            started = time.perf_counter()
+            size = 0
+            async for chunk in saad.export_items(BenchExportItem, format).body_iterator:
+                size += len(chunk.encode() if isinstance(chunk, str) else chunk)
+            results.append(summarize(f"stream {format}", rows, size, time.perf_counter() - started, rss_before))
+    finally:
+        await saad.async_engine.dispose()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = make_parser("Streaming export throughput and memory vs loading every row")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    saad = Saad(db_url=args.database_url)
+    table = BenchExportItem.__table__
+    create_table(saad.engine, table, args.rows, "i % 100, 'item ' || i, random()")
+
+    results = asyncio.run(stream(saad, args.rows, ["ndjson", "csv"]))
+
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    with Session(saad.engine) as session:
+        items = session.exec(select(BenchExportItem)).all()
+        body = json.dumps([item.model_dump() for item in items]).encode()
+    results.append(summarize(".all() + JSON (before)", len(items), len(body), time.perf_counter() - started, rss_before))
+
+    print_table(results)
+    if not args.keep:
+        table.drop(saad.engine)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
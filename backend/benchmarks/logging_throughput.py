@@ -0,0 +1,113 @@
+"""
+read_items throughput under each logging setup, with stdout going to a
+pipe (the default) or the terminal the benchmark runs in.
+
+    python -m benchmarks.logging_throughput --requests 2000
+    python -m benchmarks.logging_throughput --stdout inherit
+
+"print (before)" stands in for the print() tracing the routes did before
+queued logging: every trace point is written to stdout, unsampled, on the
+request thread. "queued" is setup_logging() at its defaults, and "queued,
+DEBUG" raises the root level to DEBUG so sampled traces go through the
+queue too. Each setup runs in its own interpreter. By default this process
+reads and discards the workers' stdout; results are printed to stderr.
+"""
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from typing import List, Optional
+
+from fastapi.testclient import TestClient
+from sqlmodel import Field, SQLModel
+
+from app.db import get_engine
+from app.routes.engine import Saad
+from benchmarks.common import create_table, make_parser, print_table
+
+MODES = {"print": "print (before)", "queued": "queued (INFO)", "queued-debug": "queued, DEBUG"}
+
+
+class BenchLogItem(SQLModel, table=True):
+    __tablename__ = "bench_log_item"
+
+    id: int | None = Field(default=None, primary_key=True)
+    category: int = Field(index=True)
+    name: str
+    score: float
+
+
+def worker(mode: str, database_url: Optional[str], requests: int) -> dict:
+    """Serve read_items under one logging setup and return its throughput."""
+    saad = Saad(db_url=database_url)
+    root = logging.getLogger()
+    if mode == "print":
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(logging.Formatter("%(message)s"))
+        root.handlers = [output]
+        root.setLevel(logging.DEBUG)
+    elif mode == "queued-debug":
+        root.setLevel(logging.DEBUG)
+    # TestClient's own per-request log line isn't part of the app
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    saad.include_router(saad.create_crud_router(BenchLogItem))
+    client = TestClient(saad)
+    params = {"page": 2, "search": "item 1", "sort_by": "score", "filter": json.dumps({"category": 7})}
+
+    def page():
+        client.get("/bench_log_item/", params=params).raise_for_status()
+
+    for _ in range(50):
+        page()
+    started = time.perf_counter()
+    for _ in range(requests):
+        page()
+    elapsed = time.perf_counter() - started
+    return {"logging": MODES[mode], "requests": requests, "seconds": round(elapsed, 2), "req_per_s": round(requests / elapsed)}
+
+
+def run_worker(mode: str, args) -> dict:
+    command = [sys.executable, "-m", "benchmarks.logging_throughput", "--worker", mode, "--requests", str(args.requests)]
+    if args.database_url:
+        command += ["--database-url", args.database_url]
+    # The workers' log lines go to stdout; with a pipe this process reads and discards them
+    result = subprocess.run(
+        command, stdout=None if args.stdout == "inherit" else subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    stderr = result.stderr
+    lines = [line for line in stderr.splitlines() if line.startswith("RESULT ")]
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(f"{mode} worker failed:\n{stderr}")
+    return json.loads(lines[-1][len("RESULT "):])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = make_parser("read_items throughput with print-style tracing vs queued logging")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--stdout", choices=["pipe", "inherit"], default="pipe",
+                        help="Send the workers' log output to a pipe this process reads, or to this terminal")
+    parser.add_argument("--worker", choices=list(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print("RESULT " + json.dumps(worker(args.worker, args.database_url, args.requests)), file=sys.stderr)
+        return 0
+
+    engine = get_engine(args.database_url)
+    table = BenchLogItem.__table__
+    create_table(engine, table, args.rows, "i % 100, 'item ' || i, random()")
+    results = [run_worker(mode, args) for mode in MODES]
+    with redirect_stdout(sys.stderr):
+        print_table(results)
+    if not args.keep:
+        table.drop(engine)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
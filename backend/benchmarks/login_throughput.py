@@ -0,0 +1,81 @@
+"""
+Login throughput with bcrypt verified inline on the event loop, as /token
+did before the hashing pool, against thread and process pools of several
+sizes.
+
+    python -m benchmarks.login_throughput --logins 64 --workers 1 2 4 8
+
+Each run fires --logins concurrent verifications from one event loop. A
+ticker coroutine that wakes every 10ms records how late it was woken, so
+max_loop_lag_ms shows how long other requests would have been stalled.
+The cost is BCRYPT_ROUNDS, as in the app.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+
+from app.utils import BCRYPT_ROUNDS, get_password_hash, verify_password
+from benchmarks.common import print_table
+
+PASSWORD = "correct horse battery staple"
+
+
+async def run(logins: int, hashed: str, executor: Optional[Executor]) -> dict:
+    loop = asyncio.get_running_loop()
+    lags = [0.0]
+    done = False
+
+    async def ticker():
+        while not done:
+            scheduled = time.perf_counter() + 0.01
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - scheduled)
+
+    async def login():
+        if executor is None:
+            assert verify_password(PASSWORD, hashed)
+        else:
+            assert await loop.run_in_executor(executor, verify_password, PASSWORD, hashed)
+
+    ticking = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await asyncio.gather(*[login() for _ in range(logins)])
+    elapsed = time.perf_counter() - started
+    done = True
+    await ticking
+    return {
+        "logins": logins,
+        "seconds": round(elapsed, 2),
+        "logins_per_s": round(logins / elapsed, 1),
+        "max_loop_lag_ms": round(max(lags) * 1000, 1),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # No database involved, so not the shared parser
+    parser = argparse.ArgumentParser(description="Login throughput with bcrypt inline vs in a thread or process pool")
+    parser.add_argument("--logins", type=int, default=64, help="Concurrent logins per run")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args(argv)
+
+    hashed = get_password_hash(PASSWORD)
+    print(f"bcrypt rounds: {BCRYPT_ROUNDS}, cpus: {os.cpu_count()}")
+
+    results = [{"hashing": "inline (before)", "workers": "-", **asyncio.run(run(args.logins, hashed, None))}]
+    for kind, executor_class in (("thread", ThreadPoolExecutor), ("process", ProcessPoolExecutor)):
+        for workers in sorted(set(args.workers)):
+            with executor_class(max_workers=workers) as executor:
+                # Start every worker before timing, as a warm pool in the app would be
+                list(executor.map(verify_password, [PASSWORD] * workers, [hashed] * workers))
+                results.append({"hashing": kind, "workers": workers, **asyncio.run(run(args.logins, hashed, executor))})
+    print_table(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
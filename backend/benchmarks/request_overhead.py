@@ -0,0 +1,134 @@
+"""
+Python time spent per read_items request with the database stubbed out:
+building conditions and the statement from the model's QueryPlan, the
+compiled-cache key lookup, and, through the route, FastAPI's parameter
+handling and response serialization.
+
+    python -m benchmarks.request_overhead --calls 5000
+
+The stub session answers every query with no rows and a count of 0, so
+nothing here waits on I/O. "list_items" calls the handler method
+directly; "route" sends the request through the ASGI app with get_db
+overridden by the stub.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import sys
+import time
+from typing import List, Optional
+from urllib.parse import urlencode
+
+from sqlmodel import Field, SQLModel
+
+from app.routes.engine import Saad
+from benchmarks.common import print_table
+
+
+class BenchOverheadItem(SQLModel, table=True):
+    __tablename__ = "bench_overhead_item"
+
+    id: int | None = Field(default=None, primary_key=True)
+    name: str
+    city: Optional[str] = None
+    size: int = 0
+    made: Optional[datetime.datetime] = None
+
+
+# Label, then list_items arguments: page, page_size, sort_by, sort_order, search, filter, count, cursor
+SHAPES = [
+    ("first page", (1, 20, None, "asc", None, {}, "none", None)),
+    ("filter + sort + search", (2, 20, "size", "desc", "abc", {"city": {"eq": "Paris"}, "size": {"eq": "3"}}, "none", None)),
+    ("range filter", (1, 20, None, "asc", None, {"size": {"between": [1, 5]}, "made": {"gte": "2024-01-01T00:00:00"}}, "none", None)),
+    ("keyset cursor", (1, 20, "size", "asc", None, {"name": {"eq": "x"}}, "none", "")),
+]
+
+
+class StubResult:
+    def all(self):
+        return []
+
+    def one(self):
+        return 0
+
+
+class StubSession:
+    async def exec(self, statement, params=None):
+        # Executing would look the statement up in the compiled cache; keep that part
+        statement._generate_cache_key()
+        return StubResult()
+
+
+async def stub_db():
+    yield StubSession()
+
+
+def query_string(args: tuple) -> bytes:
+    page, page_size, sort_by, sort_order, search, filter_dict, count, cursor = args
+    params = {"page": page, "page_size": page_size, "sort_order": sort_order, "count": count}
+    for name, value in (("sort_by", sort_by), ("search", search), ("cursor", cursor)):
+        if value is not None:
+            params[name] = value
+    if filter_dict:
+        params["filter"] = json.dumps(filter_dict)
+    return urlencode(params).encode()
+
+
+async def call_route(saad: Saad, path: str, query: bytes) -> None:
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": query,
+        "headers": [], "root_path": "", "scheme": "http", "server": ("benchmark", 80), "client": ("benchmark", 1),
+        "http_version": "1.1",
+    }
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await saad(scope, receive, send)
+    assert status == [200], status
+
+
+async def per_call_us(fn, calls: int) -> float:
+    for _ in range(min(calls, 200)):
+        await fn()
+    started = time.perf_counter()
+    for _ in range(calls):
+        await fn()
+    return round((time.perf_counter() - started) / calls * 1e6, 1)
+
+
+async def run(saad: Saad, calls: int) -> List[dict]:
+    db = StubSession()
+    path = f"/{BenchOverheadItem.__tablename__}/"
+    results = []
+    for label, args in SHAPES:
+        query = query_string(args)
+        results.append({
+            "request": label,
+            "list_items_us": await per_call_us(lambda: saad.list_items(db, BenchOverheadItem, *args), calls),
+            "route_us": await per_call_us(lambda: call_route(saad, path, query), calls),
+        })
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # No database involved, so not the shared parser
+    parser = argparse.ArgumentParser(description="Per-request Python overhead of read_items without the database")
+    parser.add_argument("--calls", type=int, default=5000, help="Calls per request shape")
+    args = parser.parse_args(argv)
+
+    saad = Saad(db_url="sqlite://", index_advisor=False, response_cache=False)
+    saad.include_router(saad.create_crud_router(BenchOverheadItem))
+    saad.dependency_overrides[saad.get_db] = stub_db
+    print_table(asyncio.run(run(saad, args.calls)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Routing cost as the number of dynamic models grows: a router per model
+(the default) against the generic dispatcher (SAAD_GENERIC_DISPATCH=true).
+
+    python -m benchmarks.routing --models 10 100 1000
+
+Requests go to the last model registered, so router mode has to scan past
+every other model's routes. The item id is not an integer, so each
+request stops at path validation with a 422 and no database work is
+timed. Nothing connects to the database.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import List, Optional
+
+from sqlalchemy.orm import registry
+from sqlmodel import Field, SQLModel
+
+from app.routes.engine import Saad
+from benchmarks.common import print_table
+
+
+def make_models(count: int) -> list:
+    # A registry per run, so the runs' tables don't collide in SQLModel.metadata
+    base = type("RoutingBase", (SQLModel,), {}, registry=registry())
+    return [
+        type(f"BenchRouting{index}", (base,), {
+            "__annotations__": {"id": Optional[int], "name": str},
+            "__tablename__": f"bench_routing_{index}",
+            "id": Field(default=None, primary_key=True),
+            "name": Field(),
+        }, table=True)
+        for index in range(count)
+    ]
+
+
+async def no_db():
+    # Dependencies are solved alongside path validation, so get_db would otherwise open a session
+    yield None
+
+
+async def call(app: Saad, path: str) -> None:
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": [], "root_path": "", "scheme": "http", "server": ("benchmark", 80), "client": ("benchmark", 1),
+        "http_version": "1.1",
+    }
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    assert status == [422], status
+
+
+async def per_request_us(app: Saad, path: str, requests: int) -> float:
+    for _ in range(200):
+        await call(app, path)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    return round((time.perf_counter() - started) / requests * 1e6, 1)
+
+
+def run(models: int, dispatch: bool, requests: int) -> dict:
+    app = Saad(db_url="sqlite://", generic_dispatch=dispatch)
+    app.dependency_overrides[app.get_db] = no_db
+    model_classes = make_models(models)
+    started = time.perf_counter()
+    for model_class in model_classes:
+        if dispatch:
+            app.register_model(model_class)
+        else:
+            app.include_router(app.create_crud_router(model_class))
+    registered = time.perf_counter() - started
+    path = f"/{model_classes[-1].__tablename__}/not-an-id"
+    return {
+        "models": models,
+        "mode": "dispatch" if dispatch else "router (before)",
+        "routes": len(app.router.routes),
+        "openapi_paths": len(app.openapi()["paths"]),
+        "register_s": round(registered, 2),
+        "request_us": asyncio.run(per_request_us(app, path, requests)),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # No database involved, so not the shared parser
+    parser = argparse.ArgumentParser(description="Per-request routing cost by number of dynamic models")
+    parser.add_argument("--models", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=3000, help="Requests per model count and mode")
+    args = parser.parse_args(argv)
+
+    print_table([run(models, dispatch, args.requests) for models in args.models for dispatch in (False, True)])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
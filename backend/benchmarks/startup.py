@@ -0,0 +1,103 @@
+"""
+Time to import app.main as the number of generated models grows, with the
+dynamic routers registered lazily (SAAD_LAZY_ROUTERS=true, the default)
+and eagerly, as every router was imported at startup before.
+
+    python -m benchmarks.startup --models 15 100 1000
+
+For each count, a copy of app/ is made in a temporary directory with that
+many generated model packages in place of app/models. Each import runs in
+a fresh interpreter, and interpreter startup itself is not counted.
+Nothing connects to the database.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from app.templates.api_template import get_api_template
+from benchmarks.common import print_table
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+# Laid out like the model.py files define_model generates
+MODEL_TEMPLATE = """from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+class {model_name}(SQLModel, table=True):
+    id: int = Field(default=None, primary_key=True)
+    name: str = Field()
+    size: Optional[int] = Field(default=None)
+    created: Optional[datetime] = Field(default=None)
+"""
+
+IMPORT_SCRIPT = """
+import sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+routers = sum(1 for name in sys.modules if name.startswith("app.models.") and name.endswith(".api"))
+print(elapsed, routers)
+"""
+
+
+def build_tree(root: Path, models: int) -> None:
+    """Copy app/ under root, with `models` generated model packages in app/models."""
+    shutil.copytree(BACKEND / "app", root / "app", ignore=shutil.ignore_patterns("__pycache__", "models"))
+    if (BACKEND / ".env").exists():
+        shutil.copy(BACKEND / ".env", root / ".env")
+    models_dir = root / "app" / "models"
+    models_dir.mkdir()
+    (models_dir / "__init__.py").write_text("")
+    for index in range(models):
+        model_name = f"BenchStartup{index}"
+        package = models_dir / model_name.lower()
+        package.mkdir()
+        (package / "__init__.py").write_text("")
+        (package / "model.py").write_text(MODEL_TEMPLATE.format(model_name=model_name))
+        (package / "api.py").write_text(get_api_template(model_name, model_name.lower()))
+
+
+def time_import(root: Path, lazy: bool) -> tuple:
+    env = {**os.environ, "SAAD_LAZY_ROUTERS": "true" if lazy else "false", "SAAD_GENERIC_DISPATCH": "false"}
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT], cwd=root, env=env, capture_output=True, text=True, check=True
+    )
+    elapsed, routers = result.stdout.split()[-2:]
+    return float(elapsed), int(routers)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # No database involved, so not the shared parser
+    parser = argparse.ArgumentParser(description="Import time of app.main by number of generated models")
+    parser.add_argument("--models", type=int, nargs="+", default=[15, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3, help="Imports per count and mode")
+    args = parser.parse_args(argv)
+
+    results = []
+    for models in args.models:
+        with tempfile.TemporaryDirectory(prefix="habitly-startup-") as directory:
+            root = Path(directory)
+            build_tree(root, models)
+            for lazy in (True, False):
+                runs = [time_import(root, lazy) for _ in range(args.repeat)]
+                timings = sorted(elapsed for elapsed, _ in runs)
+                results.append({
+                    "models": models,
+                    "routers": "lazy" if lazy else "eager (before)",
+                    "routers_imported": runs[0][1],
+                    "median_s": round(statistics.median(timings), 3),
+                    "min_s": round(timings[0], 3),
+                })
+    print_table(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+The app's own endpoints must resolve ahead of the dynamic model routes in
+every routing mode. app.main reads the mode when it is imported, so each
+mode is checked in a fresh interpreter.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+APP_ENDPOINTS = {
+    "/": "read_root",
+    "/scheduler/status": "check_scheduler",
+    "/db/pool": "check_pool",
+    "/auth/user-cache": "check_user_cache",
+    "/mail/status": "check_mail",
+    "/logging/status": "check_logging",
+}
+
+# Prints the endpoint that serves a GET of each path, from the first fully matching route
+MATCH_SCRIPT = """
+import json, sys
+from starlette.routing import Match
+from app.main import app
+
+matched = {}
+for path in json.loads(sys.argv[1]):
+    scope = {"type": "http", "method": "GET", "path": path, "root_path": ""}
+    route = next(route for route in app.routes if route.matches(scope)[0] == Match.FULL)
+    matched[path] = route.endpoint.__name__
+print(json.dumps(matched))
+"""
+
+# Settings app.main needs at import time; nothing connects to them
+REQUIRED_ENV = {
+    "POSTGRES_USER": "habitly", "POSTGRES_PASSWORD": "habitly", "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432", "POSTGRES_DB": "habitly", "SECRET_KEY": "test", "ALGORITHM": "HS256",
+    "MAIL_PORT": "25", "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+}
+
+
+@pytest.mark.parametrize("generic_dispatch", ["true", "false"])
+def test_app_endpoints_resolve_before_dynamic_routes(generic_dispatch):
+    env = {**REQUIRED_ENV, **os.environ, "SAAD_GENERIC_DISPATCH": generic_dispatch}
+    result = subprocess.run(
+        [sys.executable, "-c", MATCH_SCRIPT, json.dumps(list(APP_ENDPOINTS))],
+        cwd=BACKEND, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == APP_ENDPOINTS
@@ -0,0 +1,131 @@
+"""
+MailDispatcher against an in-process aiosmtpd server: connection reuse,
+retries with exponential backoff, giving up, and the circuit breaker.
+"""
+import socket
+import time
+
+import emails
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.mail import CircuitBreaker, MailDispatcher
+
+
+class RecordingHandler:
+    """Accepts mail after answering the first `failures` DATA commands with `status`."""
+
+    def __init__(self, failures: int = 0, status: str = "451 Try again later"):
+        self.failures = failures
+        self.status = status
+        self.attempts: list[float] = []
+        self.delivered: list[str] = []
+        self.sessions: set = set()
+
+    async def handle_DATA(self, server, session, envelope):
+        self.attempts.append(time.monotonic())
+        self.sessions.add(session)
+        if len(self.attempts) <= self.failures:
+            return self.status
+        self.delivered.extend(envelope.rcpt_tos)
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def message():
+    return emails.Message(subject="Hello", html="<p>Hello</p>", mail_from="habitly@example.com")
+
+
+def wait_for(condition, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for the dispatcher")
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def smtp_server(request):
+    handler = RecordingHandler(**getattr(request, "param", {}))
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller
+    controller.stop()
+
+
+def dispatcher_for(controller, **kwargs) -> MailDispatcher:
+    return MailDispatcher({"host": controller.hostname, "port": controller.port}, **kwargs)
+
+
+def test_batch_reuses_one_connection(smtp_server):
+    dispatcher = dispatcher_for(smtp_server, workers=1, batch_size=50)
+    for i in range(20):
+        assert dispatcher.enqueue(message(), f"user{i}@example.com")
+    dispatcher.stop()
+
+    handler = smtp_server.handler
+    assert len(handler.delivered) == 20
+    assert len(handler.sessions) == 1
+    stats = dispatcher.stats()
+    assert stats["sent"] == 20
+    assert stats["connections"] == 1
+
+
+@pytest.mark.parametrize("smtp_server", [{"failures": 2}], indirect=True)
+def test_transient_failure_is_retried_with_backoff(smtp_server):
+    dispatcher = dispatcher_for(smtp_server, workers=1, retry_backoff=0.2, max_retries=3)
+    dispatcher.enqueue(message(), "user@example.com")
+    wait_for(lambda: dispatcher.stats()["sent"] == 1)
+    dispatcher.stop()
+
+    handler = smtp_server.handler
+    assert handler.delivered == ["user@example.com"]
+    first, second, third = handler.attempts
+    # Backoff doubles: 0.2s before the second attempt, 0.4s before the third
+    assert second - first >= 0.2
+    assert third - second >= 0.4
+    stats = dispatcher.stats()
+    assert stats["retried"] == 2
+    assert stats["failed"] == 0
+    # A failed send drops the connection, so each attempt opened a new one
+    assert stats["connections"] == 3
+
+
+@pytest.mark.parametrize("smtp_server", [{"failures": 100, "status": "554 Rejected"}], indirect=True)
+def test_gives_up_after_max_retries(smtp_server):
+    dispatcher = dispatcher_for(smtp_server, workers=1, retry_backoff=0.05, max_retries=2)
+    dispatcher.enqueue(message(), "user@example.com")
+    wait_for(lambda: dispatcher.stats()["failed"] == 1)
+    dispatcher.stop()
+
+    assert len(smtp_server.handler.attempts) == 3
+    assert smtp_server.handler.delivered == []
+    assert dispatcher.stats()["retried"] == 2
+
+
+def test_circuit_breaker_stops_attempts_until_cooldown():
+    # Nothing listens on this port, so every connection attempt fails
+    breaker = CircuitBreaker(threshold=2, cooldown=1.5)
+    dispatcher = MailDispatcher(
+        {"host": "127.0.0.1", "port": free_port(), "timeout": 1},
+        workers=1, retry_backoff=0.05, max_retries=10, breaker=breaker,
+    )
+    for i in range(5):
+        dispatcher.enqueue(message(), f"user{i}@example.com")
+    wait_for(lambda: breaker.state == "open")
+    opened = dispatcher.stats()["connections"]
+    assert opened == 2
+
+    # While open, no further connections are attempted
+    time.sleep(1)
+    assert breaker.state == "open"
+    assert dispatcher.stats()["connections"] == opened
+
+    # After the cooldown one probe is let through; it fails and reopens the breaker
+    wait_for(lambda: dispatcher.stats()["connections"] == opened + 1 and breaker.state == "open", timeout=5)
+    dispatcher.stop(timeout=0)